@@ -1,48 +1,51 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from bs4 import BeautifulSoup
 import json
+import orjson
 import time
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
+from collections import deque
 from urllib.parse import urljoin
 import logging
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from threading import Lock
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class OpenHardwareScraper:
-    def __init__(self, base_url: str = "https://www.openhardware.io/", delay: float = 2.0):
-        self.base_url = base_url
-        self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+# Patterns used on every page/row, compiled once
+_GITHUB_URL_RE = re.compile(r'https?://github\.com/[^\s\)]+', re.IGNORECASE)
+_NUM_RE = re.compile(r'\d+')
+_COST_RE = re.compile(r'[\d,]+\.?\d*')
 
-    def load_project_names(self, filename: str) -> List[str]:
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                return [line.strip() for line in f if line.strip()]
-        except FileNotFoundError:
-            logger.error(f"File {filename} not found")
-            return []
+# Null bytes and replacement characters left over from bad encodings, deleted in one translate() pass
+_TRANSTAB = str.maketrans('', '', '\x00\ufffd')
 
-    def build_url(self, page_name: str) -> str:
-        page_name = page_name.lstrip('/')
-        return urljoin(self.base_url, page_name)
+# Words that mark a repeated BOM header row (first cell / second cell)
+_BOM_HEADER_WORDS = ('id', 'name', 'designator', 'qty', 'quantity', 'component')
+_BOM_NAMEVAL_WORDS = ('name', 'value', 'component')
+
+# (substring, statistics key) pairs used to classify action rows
+_STAT_KEYS = (('like', 'likes'), ('collect', 'collects'), ('comment', 'comments'), ('download', 'downloads'))
+
+_SECTIONS_SELECTOR = ('div.title, div.creator, div.overview, div.actionRow, '
+                      'div#tabs-design, div#tabs-bom')
+
+class ProjectPageParser:
+    """Stateless parsing of an openhardware.io project page; safe to use from worker processes."""
 
     def clean_text(self, text: str) -> str:
         """Clean text by removing null bytes and other encoding artifacts"""
         if not text:
             return ""
-        # Remove null bytes and other common encoding artifacts
-        cleaned = text.replace('\x00', '').replace('\u0000', '')
-        cleaned = cleaned.replace('', '').replace('\ufffd', '')
-        # Clean up extra whitespace
-        cleaned = ' '.join(cleaned.split())
-        return cleaned.strip()
+        # Remove encoding artifacts, then collapse whitespace (split/join already trims the ends)
+        return ' '.join(text.translate(_TRANSTAB).split())
 
     def extract_text_or_none(self, element) -> Optional[str]:
         if not element:
@@ -53,36 +56,79 @@ class OpenHardwareScraper:
     def extract_number_from_text(self, text: str) -> Optional[int]:
         if not text:
             return None
-        match = re.search(r'\d+', text.replace(',', ''))
+        match = _NUM_RE.search(text.replace(',', ''))
         return int(match.group()) if match else None
 
-    def parse_project_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    def parse_project_metadata(self, soup: BeautifulSoup, url: str,
+                               sections: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         data = {}
-        title_elem = soup.find('div', class_='title')
+        if sections is None:
+            title_elem = soup.select_one('div.title')
+            creator_elem = soup.select_one('div.creator')
+        else:
+            title_elem = sections.get('title')
+            creator_elem = sections.get('creator')
         data['project_name'] = self.extract_text_or_none(title_elem)
         data['project_url'] = url
-        creator_elem = soup.find('div', class_='creator')
-        if creator_elem:
-            author_link = creator_elem.find('a')
-            if author_link:
-                author_text = author_link.get_text(strip=True)
-                data['project_author'] = author_text.replace('by ', '')
-            else:
-                data['project_author'] = None
+        author_link = creator_elem.select_one('a') if creator_elem else None
+        if author_link:
+            author_text = author_link.get_text(strip=True)
+            data['project_author'] = author_text.replace('by ', '')
         else:
             data['project_author'] = None
         return data
 
-    def find_github_link(self, soup: BeautifulSoup) -> Optional[str]:
-        github_links = soup.find_all('a', href=re.compile(r'github\.com', re.IGNORECASE))
-        if github_links:
-            return github_links[0].get('href')
-        text_content = soup.get_text()
-        github_match = re.search(r'https?://github\.com/[^\s\)]+', text_content, re.IGNORECASE)
+    def _github_from_links(self, soup: BeautifulSoup) -> Optional[str]:
+        github_link = soup.select_one('a[href*="github.com" i]')
+        if github_link:
+            return github_link.get('href')
+        return None
+
+    def _github_from_text(self, soup: BeautifulSoup) -> Optional[str]:
+        # Serialising the DOM to text is expensive, so only scan the description (or the body)
+        scope = soup.select_one('div.description') or soup.body or soup
+        github_match = _GITHUB_URL_RE.search(scope.get_text())
         if github_match:
             return github_match.group()
         return None
 
+    def find_github_link(self, soup: BeautifulSoup) -> Optional[str]:
+        return self._github_from_links(soup) or self._github_from_text(soup)
+
+    def _overview_text(self, right) -> str:
+        return right.get_text(strip=True)
+
+    def _overview_views(self, right) -> int:
+        return self.extract_number_from_text(right.get_text(strip=True)) or 0
+
+    def _overview_github(self, right) -> Optional[str]:
+        github_link = right.select_one('a')
+        if github_link and github_link.get('href'):
+            href = github_link.get('href')
+            if href.startswith('/') and not href.startswith('//'):
+                href = f"https://github.com{href}"
+            return href
+        return None
+
+    def _overview_homepage(self, right) -> Optional[str]:
+        homepage_link = right.select_one('a')
+        if homepage_link and homepage_link.get('href'):
+            return homepage_link.get('href')
+        homepage_text = right.get_text(strip=True)
+        if homepage_text.startswith('http'):
+            return homepage_text
+        return None
+
+    # Checked in order and the first token found in the row label wins, as the old elif chain did
+    _overview_handlers = {
+        'license': _overview_text,
+        'created': _overview_text,
+        'updated': _overview_text,
+        'views': _overview_views,
+        'github': _overview_github,
+        'homepage': _overview_homepage,
+    }
+
     def parse_overview_section(self, soup: BeautifulSoup) -> Dict[str, Any]:
         data = {
             'license': None,
@@ -92,106 +138,68 @@ class OpenHardwareScraper:
             'github': None,
             'homepage': None
         }
-        overview = soup.find('div', class_='overview')
-        if not overview:
-            return data
-        rows = overview.find_all('div', class_='row')
+        rows = soup.select('div.overview div.row') if soup else []
         for row in rows:
-            left = row.find('div', class_='left')
-            right = row.find('div', class_='right')
+            left = row.select_one('div.left')
+            right = row.select_one('div.right')
             if not left or not right:
                 continue
-            original_key = left.get_text(strip=True)
-            key = original_key.lower().rstrip(':')
-            if 'license' in key:
-                data['license'] = right.get_text(strip=True)
-            elif 'created' in key:
-                data['created'] = right.get_text(strip=True)
-            elif 'updated' in key:
-                data['updated'] = right.get_text(strip=True)
-            elif 'views' in key:
-                views_text = right.get_text(strip=True)
-                data['views'] = self.extract_number_from_text(views_text) or 0
-            elif 'github' in key:
-                github_link = right.find('a')
-                if github_link and github_link.get('href'):
-                    href = github_link.get('href')
-                    if href.startswith('/') and not href.startswith('//'):
-                        href = f"https://github.com{href}"
-                    data['github'] = href
-                else:
-                    data['github'] = None
-            elif 'homepage' in key:
-                homepage_link = right.find('a')
-                if homepage_link and homepage_link.get('href'):
-                    data['homepage'] = homepage_link.get('href')
-                else:
-                    homepage_text = right.get_text(strip=True)
-                    if homepage_text.startswith('http'):
-                        data['homepage'] = homepage_text
-                    else:
-                        data['homepage'] = None
+            key = left.get_text(strip=True).lower().rstrip(':')
+            for token, handler in self._overview_handlers.items():
+                if token in key:
+                    data[token] = handler(self, right)
+                    break
         return data
 
-    def parse_statistics(self, soup: BeautifulSoup) -> Dict[str, int]:
+    def parse_statistics(self, soup: BeautifulSoup, action_rows: Optional[List[Any]] = None) -> Dict[str, int]:
         stats = {
             'likes': 0,
             'collects': 0,
             'comments': 0,
             'downloads': 0
         }
-        action_rows = soup.find_all('div', class_='actionRow')
+        if action_rows is None:
+            action_rows = soup.select('div.actionRow')
         for row in action_rows:
             row_id = row.get('id', '').lower()
-            count_elem = row.find('span', class_='count')
+            count_elem = row.select_one('span.count')
             if not count_elem:
                 continue
             count_text = count_elem.get_text(strip=True)
             count = self.extract_number_from_text(count_text) or 0
-            if 'like' in row_id or 'like' in ' '.join(row.get('class', [])):
-                stats['likes'] = count
-            elif 'collect' in row_id or 'collect' in ' '.join(row.get('class', [])):
-                stats['collects'] = count
-            elif 'comment' in row_id or 'comment' in ' '.join(row.get('class', [])):
-                stats['comments'] = count
-            elif 'download' in row_id or 'download' in ' '.join(row.get('class', [])):
-                stats['downloads'] = count
+            # Classify on id + class first; only fall back to the row's text when neither names the stat
+            haystack = f"{row_id} {' '.join(row.get('class', []))}".lower()
+            for token, key in _STAT_KEYS:
+                if token in haystack:
+                    stats[key] = count
+                    break
             else:
                 row_text = row.get_text(strip=True).lower()
-                if 'like' in row_text and stats['likes'] == 0:
-                    stats['likes'] = count
-                elif 'collect' in row_text and stats['collects'] == 0:
-                    stats['collects'] = count
-                elif 'comment' in row_text and stats['comments'] == 0:
-                    stats['comments'] = count
-                elif 'download' in row_text and stats['downloads'] == 0:
-                    stats['downloads'] = count
+                for token, key in _STAT_KEYS:
+                    if token in row_text and stats[key] == 0:
+                        stats[key] = count
+                        break
         return stats
 
     def parse_design_files(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         files = []
-        design_tab = soup.find('div', id='tabs-design')
-        if not design_tab:
-            return files
-        
-        table = design_tab.find('table')
+        table = soup.select_one('div#tabs-design table') if soup else None
         if not table:
             return files
         
         # Find all tr elements that contain td elements (data rows, not header rows)
-        data_rows = table.find_all('tr')
-        data_rows = [row for row in data_rows if row.find('td')]
+        data_rows = table.select('tr:has(td)')
         
         for row in data_rows:
-            cells = row.find_all('td')
+            cells = row.select('td')
             if len(cells) >= 3:
                 # Extract name from first cell
                 name_cell = cells[0]
-                link = name_cell.find('a')
+                link = name_cell.select_one('a')
                 
                 if link:
                     # Remove the icon element and get clean text
-                    icon = link.find('i')
+                    icon = link.select_one('i')
                     if icon:
                         icon.decompose()  # Remove the icon element
                     name = link.get_text(strip=True)
@@ -214,20 +222,14 @@ class OpenHardwareScraper:
     def parse_bill_of_materials(self, soup: BeautifulSoup) -> tuple[List[Dict[str, Any]], Optional[float]]:
         bom = []
         total_cost = None
-        bom_tab = soup.find('div', id='tabs-bom')
-        if not bom_tab:
-            return bom, total_cost
-        
-        table = bom_tab.find('table')
+        table = soup.select_one('div#tabs-bom table') if soup else None
         if not table:
             return bom, total_cost
         
         # Extract headers from the table
         headers = []
-        header_row = table.find('thead')
-        if header_row:
-            header_cells = header_row.find_all('th')
-            headers = [self.clean_text(cell.get_text(strip=True)) for cell in header_cells]
+        header_cells = table.select('thead th')
+        headers = [self.clean_text(cell.get_text(strip=True)) for cell in header_cells]
         
         # Remove empty headers and clean up any encoding issues
         cleaned_headers = []
@@ -240,11 +242,10 @@ class OpenHardwareScraper:
                 cleaned_headers.append(f"Column_{len(cleaned_headers) + 1}")  # Fallback name
         
         # Find all data rows (those containing td elements)
-        all_rows = table.find_all('tr')
-        data_rows = [row for row in all_rows if row.find('td')]
+        data_rows = table.select('tr:has(td)')
         
         for row in data_rows:
-            cells = row.find_all('td')
+            cells = row.select('td')
             if not cells:  # Skip rows with no data cells
                 continue
                 
@@ -263,15 +264,17 @@ class OpenHardwareScraper:
                 
                 row_data[header_name] = cell_text if cell_text else None
             
+            # Lowercase each cell once for all the row checks below
+            row_lower = [cell.lower() for cell in cell_texts]
+
             # Check if this might be a total cost row (look for "total" in any cell)
-            is_total_row = any('total' in str(cell).lower() for cell in cell_texts if cell)
+            is_total_row = any('total' in cell for cell in row_lower)
             if is_total_row:
                 # Try to extract a numeric value that might be the total cost
                 for cell_text in cell_texts:
                     if cell_text:
                         # Look for patterns like "123.45", "$123.45", "123,45", etc.
-                        import re
-                        cost_match = re.search(r'[\d,]+\.?\d*', cell_text.replace('$', '').replace(',', ''))
+                        cost_match = _COST_RE.search(cell_text.replace('$', '').replace(',', ''))
                         if cost_match:
                             try:
                                 total_cost = float(cost_match.group().replace(',', ''))
@@ -285,10 +288,10 @@ class OpenHardwareScraper:
                 continue
             
             # Skip header-like rows that might appear in data (e.g., repeated headers)
-            first_cell = cell_texts[0].lower() if cell_texts else ""
-            if any(header_word in first_cell for header_word in ['id', 'name', 'designator', 'qty', 'quantity', 'component']):
+            first_cell = row_lower[0]
+            if any(header_word in first_cell for header_word in _BOM_HEADER_WORDS):
                 # But only skip if it looks exactly like headers (check if other cells match header pattern)
-                if len(cell_texts) >= 3 and any(header.lower() in cell_texts[1].lower() for header in ['name', 'value', 'component']):
+                if len(row_lower) >= 3 and any(header in row_lower[1] for header in _BOM_NAMEVAL_WORDS):
                     continue
             
             # Add the row to our BOM data
@@ -308,25 +311,133 @@ class OpenHardwareScraper:
         
         return bom, total_cost
 
-    def scrape_project(self, page_name: str) -> Optional[Dict[str, Any]]:
-        url = self.build_url(page_name)
-        logger.info(f"Scraping: {url}")
+    def find_sections(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        # One traversal collects every container the parse_* methods need, bucketed by role;
+        # the first match in document order wins, as select_one would have returned
+        sections = {'actionRow': []}
+        for node in soup.select(_SECTIONS_SELECTOR):
+            node_id = node.get('id')
+            if node_id in ('tabs-design', 'tabs-bom'):
+                sections.setdefault(node_id, node)
+                continue
+            for cls in node.get('class', ()):
+                if cls == 'actionRow':
+                    sections['actionRow'].append(node)
+                elif cls in ('overview', 'title', 'creator'):
+                    sections.setdefault(cls, node)
+        return sections
+
+    def parse_page(self, content: bytes, url: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(content, 'lxml')
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            sections = self.find_sections(soup)
             data = {}
-            metadata = self.parse_project_metadata(soup, url)
+            metadata = self.parse_project_metadata(soup, url, sections)
             data.update(metadata)
-            overview = self.parse_overview_section(soup)
+            overview = self.parse_overview_section(sections.get('overview'))
             data.update(overview)
             if not data.get('github'):
                 data['github'] = self.find_github_link(soup)
-            data['statistics'] = self.parse_statistics(soup)
-            data['design_files'] = self.parse_design_files(soup)
-            bom, total_cost = self.parse_bill_of_materials(soup)
+            data['statistics'] = self.parse_statistics(soup, sections['actionRow'])
+            data['design_files'] = self.parse_design_files(sections.get('tabs-design'))
+            bom, total_cost = self.parse_bill_of_materials(sections.get('tabs-bom'))
             data['bill_of_materials'] = bom
             data['total_cost'] = total_cost
+            return data
+        finally:
+            # The tree is full of parent/sibling reference cycles; break them now so each
+            # page is freed straight away instead of piling up until the cyclic GC runs
+            soup.decompose()
+
+
+_PAGE_PARSER = ProjectPageParser()
+
+
+def _parse_html(content: bytes, url: str) -> Dict[str, Any]:
+    # Top-level so it can be pickled into a ProcessPoolExecutor
+    return _PAGE_PARSER.parse_page(content, url)
+
+
+class OpenHardwareScraper(ProjectPageParser):
+    def __init__(self, base_url: str = "https://www.openhardware.io/", delay: float = 2.0, max_workers: int = 8,
+                 parse_workers: Optional[int] = None):
+        self.base_url = base_url
+        self.delay = delay
+        self.max_workers = max_workers
+        # All workers share one request slot every `delay` seconds, so the site sees the same
+        # rate as a serial scrape; workers only sleep when they are ahead of that rate
+        self._request_interval = delay
+        self._next_request_at = 0.0
+        self._throttle_lock = Lock()
+        # Parsing is CPU-bound and holds the GIL, so scrape_all_projects runs it in worker processes
+        self.parse_workers = parse_workers or os.cpu_count()
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        # Every request goes to one host: a single pool big enough for all workers keeps
+        # connections alive. Failures back off exponentially with jitter, and 429/503
+        # responses wait for the server's Retry-After instead when it is sent
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(32, max_workers),
+            max_retries=Retry(total=5, backoff_factor=1, backoff_jitter=1, backoff_max=60,
+                              status_forcelist=[429, 500, 502, 503, 504],
+                              respect_retry_after_header=True)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _throttle(self):
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self._request_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def iter_project_names(self, filename: str) -> Iterator[str]:
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                name = line.strip()
+                if name:
+                    yield name
+
+    def load_project_names(self, filename: str) -> List[str]:
+        try:
+            return list(self.iter_project_names(filename))
+        except FileNotFoundError:
+            logger.error(f"File {filename} not found")
+            return []
+
+    def build_url(self, page_name: str) -> str:
+        page_name = page_name.lstrip('/')
+        return urljoin(self.base_url, page_name)
+
+    def scrape_project(self, page_name: str, parse_pool: Optional[ProcessPoolExecutor] = None) -> Optional[Dict[str, Any]]:
+        url = self.build_url(page_name)
+        logger.info(f"Scraping: {url}")
+        try:
+            self._throttle()
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            # Keep only the body bytes; the response object and its headers are dropped
+            # before the (slow) parse so at most one copy of each page is alive
+            body = response.content
+            del response
+            if parse_pool:
+                data = parse_pool.submit(_parse_html, body, url).result()
+            else:
+                data = self.parse_page(body, url)
             logger.info(f"Successfully scraped: {data.get('project_name', 'Unknown')} - "
                        f"Likes: {data['statistics']['likes']}, "
                        f"Downloads: {data['statistics']['downloads']}, "
@@ -339,28 +450,48 @@ class OpenHardwareScraper:
             logger.error(f"Error scraping {url}: {e}")
             return None
 
-    def scrape_all_projects(self, filename: str = 'hardware.txt', output_file: str = 'scraped_projects.json'):
-        project_names = self.load_project_names(filename)
-        if not project_names:
-            logger.error("No project names found to scrape")
+    def scrape_all_projects(self, filename: str = 'hardware.txt', output_file: str = 'scraped_projects.jsonl'):
+        if not os.path.exists(filename):
+            logger.error(f"File {filename} not found")
             return
-        logger.info(f"Found {len(project_names)} projects to scrape")
-        results = []
+        logger.info(f"Scraping projects from {filename} with {self.max_workers} workers")
+        processed_count = 0
+        saved_count = 0
         failed_urls = []
-        for i, page_name in enumerate(project_names, 1):
-            logger.info(f"Processing {i}/{len(project_names)}: {page_name}")
-            data = self.scrape_project(page_name)
-            if data:
-                results.append(data)
-            else:
-                failed_urls.append(page_name)
-            if i < len(project_names):
-                logger.info(f"Waiting {self.delay} seconds before next request...")
-                time.sleep(self.delay)
+
+        # One JSON object per line, written as each project finishes so progress survives a crash
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved {len(results)} projects to {output_file}")
+            with open(output_file, 'wb') as f, \
+                    ProcessPoolExecutor(max_workers=self.parse_workers) as parse_pool, \
+                    ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Names are read lazily and only a small window of work is queued at a time;
+                # futures are drained in submission order so the output keeps the input order
+                pending = deque()
+                window = self.max_workers * 2
+
+                def drain_oldest():
+                    nonlocal processed_count, saved_count
+                    page_name, future = pending.popleft()
+                    data = future.result()
+                    processed_count += 1
+                    logger.info(f"Processed {processed_count}: {page_name}")
+                    if data:
+                        f.write(orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE))
+                        f.flush()
+                        saved_count += 1
+                    else:
+                        failed_urls.append(page_name)
+
+                for page_name in self.iter_project_names(filename):
+                    pending.append((page_name, executor.submit(self.scrape_project, page_name, parse_pool)))
+                    if len(pending) >= window:
+                        drain_oldest()
+                while pending:
+                    drain_oldest()
+            if not processed_count:
+                logger.error("No project names found to scrape")
+                return
+            logger.info(f"Saved {saved_count} projects to {output_file}")
         except Exception as e:
             logger.error(f"Failed to save results: {e}")
         if failed_urls:
@@ -383,8 +514,8 @@ class OpenHardwareScraper:
             print("="*60)
             if output_file:
                 try:
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
+                    with open(output_file, 'wb') as f:
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                     logger.info(f"Saved project data to {output_file}")
                 except Exception as e:
                     logger.error(f"Failed to save to file: {e}")
@@ -397,23 +528,25 @@ def main():
                        help='Scrape a single project (e.g., "view/32993/Hematuria-Meter")')
     parser.add_argument('--file', '-f', type=str, default='hardware.txt',
                        help='File containing project page names (default: hardware.txt)')
-    parser.add_argument('--output', '-o', type=str, default='scraped_projects.json',
-                       help='Output JSON file (default: scraped_projects.json)')
+    parser.add_argument('--output', '-o', type=str, default='scraped_projects.jsonl',
+                       help='Output JSON Lines file (default: scraped_projects.jsonl)')
     parser.add_argument('--delay', '-d', type=float, default=2.0,
-                       help='Delay between requests in seconds (default: 2.0)')
+                       help='Seconds between requests, shared by all workers (default: 2.0)')
+    parser.add_argument('--workers', '-w', type=int, default=8,
+                       help='Number of projects fetched concurrently (default: 8)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
     args = parser.parse_args()
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
-    scraper = OpenHardwareScraper(delay=args.delay)
-    if args.single:
-        output_file = None
-        if args.output != 'scraped_projects.json':
-            output_file = args.output
-        scraper.scrape_single_project(args.single, output_file)
-    else:
-        scraper.scrape_all_projects(args.file, args.output)
+    with OpenHardwareScraper(delay=args.delay, max_workers=args.workers) as scraper:
+        if args.single:
+            output_file = None
+            if args.output != 'scraped_projects.jsonl':
+                output_file = args.output
+            scraper.scrape_single_project(args.single, output_file)
+        else:
+            scraper.scrape_all_projects(args.file, args.output)
 
 if __name__ == "__main__":
     main()
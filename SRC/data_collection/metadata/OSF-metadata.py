@@ -1,23 +1,210 @@
 import requests
+import requests_cache
 import json
 import re
 from urllib.parse import urlparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from threading import Condition
 import time
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:
+    # orjson has no PyPy build; under pypy_main.py the stdlib json module is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ID_RE = re.compile(r'osf\.io/([a-zA-Z0-9]{5,})')
+
+# Per-project endpoints fetched side by side after the node itself
+ENDPOINT_FANOUT = 5
+# Folder listings fetched at once across all projects while crawling file trees
+FOLDER_FANOUT = 32
+
+MAX_RATE_LIMIT_RETRIES = 3
+# (connect, read) seconds
+REQUEST_TIMEOUT = (3, 10)
+
+# Relationships embedded in the node request, so most projects need no per-endpoint calls
+NODE_EMBEDS = ('contributors', 'subjects', 'license', 'citation', 'logs')
+
+# Largest page OSF serves, so long listings take as few round-trips as possible
+PAGE_SIZE = 100
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+    # Pretty-printed UTF-8 output, equivalent to json.dump(indent=2, ensure_ascii=False)
+    JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+    JSONL_DUMP_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_PASSTHROUGH_DATACLASS
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+
+@dataclass(slots=True)
+class FileEntry:
+    """One file or folder of a project's file tree; slotted since large projects hold thousands"""
+    name: str
+    kind: str
+    size: Optional[int]
+    modified: Optional[str]
+    created: Optional[str]
+    path: str
+    provider: str
+    downloads: int = 0  # Updated if metrics available
+    children: Optional[List['FileEntry']] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'name': self.name,
+            'kind': self.kind,
+            'size': self.size,
+            'modified': self.modified,
+            'created': self.created,
+            'path': self.path,
+            'provider': self.provider,
+            'downloads': self.downloads
+        }
+        # Only crawled folders carry a children list
+        if self.children is not None:
+            data['children'] = self.children
+        return data
+
+
+def _json_default(obj: Any) -> Any:
+    # OPT_PASSTHROUGH_DATACLASS makes orjson skip its own dataclass serialization and hand
+    # FileEntry here, so to_dict() keeps the old layout (no 'children' key on plain files)
+    if isinstance(obj, FileEntry):
+        return obj.to_dict()
+    return str(obj)
+
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 bytes: indented when pretty, otherwise one newline-terminated JSON line"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=JSON_DUMP_OPTIONS if pretty else JSONL_DUMP_OPTIONS, default=_json_default)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+    return (json.dumps(obj, ensure_ascii=False, default=_json_default) + '\n').encode('utf-8')
+
+
+class RateLimiter:
+    """Tracks OSF's X-RateLimit headers and only blocks callers once the quota is spent."""
 
-class OSFMetadataFetcher:
     def __init__(self):
+        self.remaining = None
+        self.reset_at = 0.0
+        self.condition = Condition()
+
+    def update(self, headers) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        reset = float(reset)
+        # Accept both an epoch timestamp and a number of seconds until the window resets
+        if reset < 1e9:
+            reset += time.time()
+        with self.condition:
+            self.remaining = int(remaining)
+            self.reset_at = reset
+            self.condition.notify_all()
+
+    def acquire(self) -> None:
+        with self.condition:
+            while self.remaining is not None and self.remaining <= 0:
+                wait = self.reset_at - time.time()
+                if wait <= 0:
+                    self.remaining = None
+                    break
+                logger.warning("Rate limit exhausted, waiting %.0fs for reset...", wait)
+                self.condition.wait(timeout=wait)
+            if self.remaining is not None:
+                # Count this request against the quota until fresh headers arrive
+                self.remaining -= 1
+
+
+class OSFMetadataFetcher:
+    def __init__(self, max_workers: int = 8, cache_name: str = 'osf_cache'):
         self.base_url = "https://api.osf.io/v2"
-        self.session = requests.Session()
+        self.max_workers = max_workers
+        # Many projects share a license, so each license id is looked up once per fetcher
+        self._license_cache = {}
+        # GETs are idempotent: re-runs are served from a local SQLite cache for a day, and
+        # responses carrying ETag/Last-Modified are revalidated with conditional requests
+        self.session = requests_cache.CachedSession(cache_name, backend='sqlite', expire_after=86400, cache_control=True)
         self.session.headers.update({
             'Accept': 'application/vnd.api+json',
             'Content-Type': 'application/vnd.api+json'
         })
+        # Every request goes to api.osf.io, so one connection pool sized for all threads keeps them alive
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers * (ENDPOINT_FANOUT + 1) + FOLDER_FANOUT)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Endpoint requests for every project share one pool instead of running one after another
+        self._endpoint_pool = ThreadPoolExecutor(max_workers=max_workers * ENDPOINT_FANOUT, thread_name_prefix="ep")
+        # Separate from the endpoint pool: folder fetches never wait on other tasks, so crawls can't deadlock it
+        self._folder_pool = ThreadPoolExecutor(max_workers=FOLDER_FANOUT, thread_name_prefix="folder")
+        self.rate_limiter = RateLimiter()
+
+    def close(self):
+        self._endpoint_pool.shutdown(wait=True)
+        self._folder_pool.shutdown(wait=True)
+        self.session.close()
     
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the rate limiter, retrying 429s after Retry-After or 2/4/8s"""
+        # Slow endpoints fail fast instead of hanging a worker
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(url, **kwargs)
+            if getattr(response, 'from_cache', False):
+                # Cached headers describe an old rate-limit window
+                return response
+            self.rate_limiter.update(response.headers)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                return response
+            retry_after = response.headers.get('Retry-After')
+            wait_time = int(retry_after) if retry_after and retry_after.isdigit() else 2 ** (attempt + 1)
+            logger.warning("Rate limited, waiting %ss before retry %s/%s", wait_time, attempt + 1, MAX_RATE_LIMIT_RETRIES)
+            time.sleep(wait_time)
+        return response
+
+    @staticmethod
+    def _json(response: requests.Response) -> Any:
+        return _loads(response.content)
+
+    def _fetch_all_pages(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a JSON:API list following links.next; returns {'data': [...]} or None if the first page fails"""
+        items = []
+        params = {'page[size]': PAGE_SIZE}
+        while url:
+            response = self._get(url, params=params)
+            if response.status_code != 200:
+                if not items:
+                    return None
+                break
+            page = self._json(response)
+            items.extend(page.get('data', []))
+            # The next link already carries the page size
+            url = (page.get('links') or {}).get('next')
+            params = None
+        return {'data': items}
+
     def extract_project_id(self, url: str) -> str:
         """Extract OSF project ID from URL"""
-        pattern = r'osf\.io/([a-zA-Z0-9]{5,})'
-        match = re.search(pattern, url)
+        match = _PROJECT_ID_RE.search(url)
         if match:
             return match.group(1)
         raise ValueError(f"Could not extract project ID from URL: {url}")
@@ -25,212 +212,263 @@ class OSFMetadataFetcher:
     def fetch_project_metadata(self, project_id: str) -> Dict[str, Any]:
         """Fetch basic project metadata with embedded data"""
         url = f"{self.base_url}/nodes/{project_id}/"
-        response = self.session.get(url)
+        response = self._get(url, params={'embed': NODE_EMBEDS})
         response.raise_for_status()
-        return response.json()
+        return self._json(response)
+    
+    @staticmethod
+    def _related_id(project_data: Dict[str, Any], name: str) -> Optional[str]:
+        """Id of a to-one relationship, from its linkage or else the last segment of its related link"""
+        relationship = (project_data.get('relationships') or {}).get(name) or {}
+        linkage = relationship.get('data')
+        if isinstance(linkage, dict) and linkage.get('id'):
+            return linkage['id']
+        related = (relationship.get('links') or {}).get('related')
+        href = related.get('href', '') if isinstance(related, dict) else related or ''
+        segments = [segment for segment in urlparse(href).path.split('/') if segment]
+        return segments[-1] if segments else None
+    
+    def fetch_license(self, license_id: str) -> Dict[str, Any]:
+        """Fetch license attributes; failures raise and so are never cached"""
+        if license_id in self._license_cache:
+            return self._license_cache[license_id]
+        response = self._get(f"{self.base_url}/licenses/{license_id}/")
+        response.raise_for_status()
+        attributes = self._json(response).get('data', {}).get('attributes', {})
+        self._license_cache[license_id] = attributes
+        return attributes
     
     def fetch_project_analytics(self, project_id: str) -> Dict[str, Any]:
         """Fetch project analytics and metrics"""
         url = f"{self.base_url}/nodes/{project_id}/analytics/"
         try:
-            response = self.session.get(url)
+            response = self._get(url)
             if response.status_code == 200:
-                return response.json()
-        except:
-            pass
+                return self._json(response)
+        except (requests.RequestException, JSONDecodeError) as e:
+            logger.warning("Error fetching analytics: %s", e)
         return {}
     
+    @staticmethod
+    def _parse_subjects(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        subjects = []
+        for subject in items:
+            subjects.append({
+                'text': subject['attributes']['text'],
+                'parents': subject['attributes'].get('parents', [])
+            })
+        return subjects
+    
+    @staticmethod
+    def _parse_contributors(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        contributors = []
+        for contrib in items:
+            user_data = contrib.get('embeds', {}).get('users', {}).get('data', {})
+            contributors.append({
+                'name': user_data.get('attributes', {}).get('full_name', 'Unknown'),
+                'permission': contrib['attributes'].get('permission'),
+                'bibliographic': contrib['attributes'].get('bibliographic', False)
+            })
+        return contributors
+    
+    @staticmethod
+    def _embedded_list(embeds: Dict[str, Any], name: str) -> Optional[List[Dict[str, Any]]]:
+        """Items of an embedded relationship, or None if it is missing, failed or spans several pages"""
+        embed = embeds.get(name)
+        if not isinstance(embed, dict) or not isinstance(embed.get('data'), list):
+            return None
+        if (embed.get('links') or {}).get('next'):
+            return None
+        return embed['data']
+    
     def fetch_project_subjects(self, project_id: str) -> List[Dict[str, Any]]:
         """Fetch project subjects/disciplines"""
         url = f"{self.base_url}/nodes/{project_id}/subjects/"
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                subjects = []
-                for subject in data.get('data', []):
-                    subjects.append({
-                        'text': subject['attributes']['text'],
-                        'parents': subject['attributes'].get('parents', [])
-                    })
-                return subjects
+            data = self._fetch_all_pages(url)
+            if data is not None:
+                return self._parse_subjects(data.get('data', []))
         except Exception as e:
-            print(f"Error fetching subjects: {e}")
+            logger.warning("Error fetching subjects: %s", e)
         return []
     
-    def fetch_storage_providers(self, project_id: str) -> List[str]:
-        """Fetch available storage providers for the project"""
+    def fetch_storage_providers(self, project_id: str) -> List[Tuple[str, str]]:
+        """Fetch available storage providers for the project as (name, root listing url) pairs"""
         url = f"{self.base_url}/nodes/{project_id}/files/"
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._fetch_all_pages(url)
+            if data is not None:
                 providers = []
                 for provider in data.get('data', []):
-                    providers.append(provider['attributes']['name'])
+                    name = provider['attributes']['name']
+                    # Crawl from the link OSF hands back rather than rebuilding it
+                    related = provider.get('relationships', {}).get('files', {}).get('links', {}).get('related', {})
+                    root_url = related.get('href', '') if isinstance(related, dict) else related
+                    providers.append((name, root_url or f"{url}{name}/"))
                 return providers
         except Exception as e:
-            print(f"Error fetching storage providers: {e}")
-        return ['osfstorage']  # Default fallback
+            logger.warning("Error fetching storage providers: %s", e)
+        return [('osfstorage', f"{url}osfstorage/")]  # Default fallback
+    
+    @staticmethod
+    def _list_total(body: Dict[str, Any]) -> Optional[int]:
+        """Item count JSON:API reports for a whole list, whichever page of it this is"""
+        meta = (body.get('links') or {}).get('meta') or body.get('meta') or {}
+        return meta.get('total')
+    
+    def fetch_project_log_count(self, project_id: str) -> int:
+        """Count project logs from the list total, without downloading the entries"""
+        url = f"{self.base_url}/nodes/{project_id}/logs/"
+        try:
+            response = self._get(url, params={'page[size]': 1})
+            if response.status_code == 200:
+                data = self._json(response)
+                total = self._list_total(data)
+                if total is not None:
+                    return total
+                return len(self.fetch_project_logs(project_id).get('data', []))
+        except (requests.RequestException, JSONDecodeError) as e:
+            logger.warning("Error fetching log count: %s", e)
+        return 0
     
     def fetch_project_logs(self, project_id: str) -> Dict[str, Any]:
         """Fetch project logs for activity metrics"""
         url = f"{self.base_url}/nodes/{project_id}/logs/"
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                return response.json()
-        except:
-            pass
+            data = self._fetch_all_pages(url)
+            if data is not None:
+                return data
+        except (requests.RequestException, JSONDecodeError) as e:
+            logger.warning("Error fetching logs: %s", e)
         return {}
     
+    def fetch_folder(self, folder_url: str, provider: str) -> List[Tuple[FileEntry, str]]:
+        """Fetch one folder listing as (file_info, children url) pairs; the url is empty for files"""
+        try:
+            logger.debug("Fetching: %s", folder_url)
+            data = self._fetch_all_pages(folder_url)
+            
+            if data is None:
+                logger.warning("Error response from %s", folder_url)
+                return []
+            
+            logger.debug("Found %s items", len(data.get('data', [])))
+            
+            files = []
+            for item in data.get('data', []):
+                if not isinstance(item, dict):
+                    continue
+                attrs = item.get('attributes', {})
+                if not isinstance(attrs, dict):
+                    continue
+                    
+                file_info = FileEntry(
+                    name=attrs.get('name', ''),
+                    kind=attrs.get('kind', ''),
+                    size=attrs.get('size'),
+                    modified=attrs.get('date_modified'),
+                    created=attrs.get('date_created'),
+                    path=attrs.get('materialized_path', ''),
+                    provider=provider
+                )
+                
+                # Try to get download metrics
+                version_info = attrs.get('current_version', {})
+                if isinstance(version_info, dict):
+                    metrics = version_info.get('metrics', {})
+                    if isinstance(metrics, dict):
+                        file_info.downloads = metrics.get('downloads', 0)
+                
+                # Folders are crawled by the caller
+                folder_files_url = ''
+                if attrs.get('kind') == 'folder':
+                    relationships = item.get('relationships', {})
+                    files_rel = relationships.get('files', {})
+                    if files_rel and 'links' in files_rel:
+                        related_link = files_rel['links'].get('related', {})
+                        if isinstance(related_link, dict):
+                            folder_files_url = related_link.get('href', '')
+                        elif isinstance(related_link, str):
+                            folder_files_url = related_link
+                
+                files.append((file_info, folder_files_url))
+            
+            return files
+        except Exception as e:
+            logger.warning("Error fetching files from %s: %s", folder_url, e)
+            return []
+    
     def fetch_file_structure(self, project_id: str) -> Dict[str, Any]:
         """Fetch file structure for all storage providers"""
+        return self.crawl_file_structure(project_id)[0]
+    
+    def crawl_file_structure(self, project_id: str) -> Tuple[Dict[str, Any], List[int], List[str]]:
+        """Fetch the file tree plus flat downloads/kinds columns of every entry for counting"""
         providers = self.fetch_storage_providers(project_id)
-        all_files = {}
+        provider_files = {}
+        downloads = []
+        kinds = []
         
-        for provider in providers:
-            print(f"Fetching files from provider: {provider}")
-            files_url = f"{self.base_url}/nodes/{project_id}/files/{provider}/"
-            
-            def get_files_recursive(folder_url: str, level: int = 0) -> List[Dict]:
-                if level > 10:  # Prevent infinite recursion
-                    return []
-                
-                try:
-                    print(f"Fetching: {folder_url}")
-                    response = self.session.get(folder_url)
-                    print(f"Response status: {response.status_code}")
-                    
-                    if response.status_code != 200:
-                        print(f"Error response: {response.text}")
-                        return []
-                    
-                    data = response.json()
-                    print(f"Found {len(data.get('data', []))} items")
-                    
-                    files = []
-                    for item in data.get('data', []):
-                        if not isinstance(item, dict):
-                            continue
-                        attrs = item.get('attributes', {})
-                        if not isinstance(attrs, dict):
-                            continue
-                            
-                        file_info = {
-                            'name': attrs.get('name', ''),
-                            'kind': attrs.get('kind', ''),
-                            'size': attrs.get('size'),
-                            'modified': attrs.get('date_modified'),
-                            'created': attrs.get('date_created'),
-                            'path': attrs.get('materialized_path', ''),
-                            'provider': provider,
-                            'downloads': 0  # Will be updated if metrics available
-                        }
-                        
-                        # Try to get download metrics
-                        version_info = attrs.get('current_version', {})
-                        if isinstance(version_info, dict):
-                            metrics = version_info.get('metrics', {})
-                            if isinstance(metrics, dict):
-                                file_info['downloads'] = metrics.get('downloads', 0)
-                        
-                        # Handle folders recursively
-                        if attrs.get('kind') == 'folder':
-                            relationships = item.get('relationships', {})
-                            files_rel = relationships.get('files', {})
-                            if files_rel and 'links' in files_rel:
-                                related_link = files_rel['links'].get('related', {})
-                                if isinstance(related_link, dict):
-                                    folder_files_url = related_link.get('href', '')
-                                elif isinstance(related_link, str):
-                                    folder_files_url = related_link
-                                else:
-                                    folder_files_url = ''
-                                
-                                if folder_files_url:
-                                    file_info['children'] = get_files_recursive(folder_files_url, level + 1)
-                        
-                        files.append(file_info)
-                    
-                    return files
-                except Exception as e:
-                    print(f"Error fetching files from {folder_url}: {e}")
-                    return []
-            
-            provider_files = get_files_recursive(files_url)
-            if provider_files:
-                all_files[provider] = provider_files
+        # Breadth-first: every folder found at one depth, across all providers, is fetched
+        # concurrently, so the crawl costs one round-trip per level instead of one per folder
+        frontier = []
+        for provider, root_url in providers:
+            logger.debug("Fetching files from provider: %s", provider)
+            frontier.append((root_url, provider, None))
+        # Each folder is listed once, however deep the tree goes; a link back to a folder
+        # already seen gets no children instead of being fetched again
+        visited = {root_url for root_url, _, _ in frontier}
         
-        return all_files
+        while frontier:
+            listings = self._folder_pool.map(lambda entry: self.fetch_folder(entry[0], entry[1]), frontier)
+            next_frontier = []
+            for (_, provider, parent), listing in zip(frontier, listings):
+                files = [file_info for file_info, _ in listing]
+                if parent is None:
+                    provider_files[provider] = files
+                else:
+                    parent.children = files
+                for file_info, folder_files_url in listing:
+                    downloads.append(file_info.downloads)
+                    kinds.append(file_info.kind)
+                    if not folder_files_url:
+                        continue
+                    if folder_files_url in visited:
+                        file_info.children = []
+                    else:
+                        visited.add(folder_files_url)
+                        next_frontier.append((folder_files_url, provider, file_info))
+            frontier = next_frontier
+        
+        return {provider: files for provider, files in provider_files.items() if files}, downloads, kinds
     
     def fetch_contributors(self, project_id: str) -> List[Dict[str, Any]]:
         """Fetch project contributors"""
         url = f"{self.base_url}/nodes/{project_id}/contributors/"
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                contributors = []
-                for contrib in data.get('data', []):
-                    user_data = contrib.get('embeds', {}).get('users', {}).get('data', {})
-                    contributors.append({
-                        'name': user_data.get('attributes', {}).get('full_name', 'Unknown'),
-                        'permission': contrib['attributes'].get('permission'),
-                        'bibliographic': contrib['attributes'].get('bibliographic', False)
-                    })
-                return contributors
-        except:
-            pass
+            data = self._fetch_all_pages(url)
+            if data is not None:
+                return self._parse_contributors(data.get('data', []))
+        except (requests.RequestException, JSONDecodeError, KeyError) as e:
+            logger.warning("Error fetching contributors: %s", e)
         return []
     
     def fetch_citations(self, project_id: str) -> Dict[str, Any]:
         """Fetch citation information"""
         url = f"{self.base_url}/nodes/{project_id}/citation/"
         try:
-            response = self.session.get(url)
+            response = self._get(url)
             if response.status_code == 200:
-                return response.json()
-        except:
-            pass
+                return self._json(response)
+        except (requests.RequestException, JSONDecodeError) as e:
+            logger.warning("Error fetching citation: %s", e)
         return {}
     
-    def count_total_downloads(self, file_structure: Dict[str, List[Dict]]) -> int:
-        """Count total downloads across all files in all providers"""
-        def count_files_recursive(files: List[Dict]) -> int:
-            total = 0
-            for item in files:
-                total += item.get('downloads', 0)
-                if item.get('children'):
-                    total += count_files_recursive(item['children'])
-            return total
-        
-        total_downloads = 0
-        for files in file_structure.values():
-            total_downloads += count_files_recursive(files)
-        return total_downloads
-    
-    def count_total_files(self, file_structure: Dict[str, List[Dict]]) -> int:
-        """Count total files across all providers"""
-        def count_files_recursive(files: List[Dict]) -> int:
-            count = 0
-            for item in files:
-                if item.get('kind') == 'file':
-                    count += 1
-                if item.get('children'):
-                    count += count_files_recursive(item['children'])
-            return count
-        
-        total_files = 0
-        for files in file_structure.values():
-            total_files += count_files_recursive(files)
-        return total_files
-    
     def process_project(self, url: str) -> Dict[str, Any]:
         """Process a single OSF project URL and return comprehensive metadata"""
         try:
             project_id = self.extract_project_id(url)
-            print(f"Processing project: {project_id}")
+            logger.debug("Processing project: %s", project_id)
             
             # Fetch basic metadata with embedded data
             metadata = self.fetch_project_metadata(project_id)
@@ -240,37 +478,61 @@ class OSFMetadataFetcher:
             
             # Extract license information
             license_info = {}
-            if 'license' in embeds and embeds['license']['data']:
-                license_data = embeds['license']['data']['attributes']
+            license_embed = embeds.get('license') or {}
+            license_data = None
+            if license_embed.get('data'):
+                license_data = license_embed['data']['attributes']
+            else:
+                # Embed missing or failed: licenses are shared, so look it up through the per-run cache
+                license_id = self._related_id(project_data, 'license')
+                if license_id:
+                    try:
+                        license_data = self.fetch_license(license_id)
+                    except (requests.RequestException, JSONDecodeError) as e:
+                        logger.warning("Error fetching license %s: %s", license_id, e)
+            if license_data:
                 license_info = {
                     'name': license_data.get('name', ''),
                     'text': license_data.get('text', ''),
                     'url': license_data.get('url', '')
                 }
             
-            # Extract subjects
-            subjects = []
-            if 'subjects' in embeds and embeds['subjects']['data']:
-                for subject in embeds['subjects']['data']:
-                    subjects.append({
-                        'text': subject['attributes']['text'],
-                        'parents': subject['attributes'].get('parents', [])
-                    })
-            else:
-                # Fallback to separate API call
-                subjects = self.fetch_project_subjects(project_id)
+            # Use whatever the node request embedded; only missing or truncated relationships
+            # get their own request. Contributors are only usable with their users embedded
+            subject_items = self._embedded_list(embeds, 'subjects')
+            # Only the number of logs is kept, and the embed reports it even when truncated
+            log_count = self._list_total(embeds['logs']) if isinstance(embeds.get('logs'), dict) else None
+            contributor_items = self._embedded_list(embeds, 'contributors')
+            if contributor_items and not all('users' in item.get('embeds', {}) for item in contributor_items):
+                contributor_items = None
+            citations = embeds.get('citation') if 'data' in (embeds.get('citation') or {}) else None
+            
+            fetches = {'analytics': self.fetch_project_analytics, 'files': self.crawl_file_structure}
+            if subject_items is None:
+                fetches['subjects'] = self.fetch_project_subjects
+            if log_count is None:
+                fetches['log_count'] = self.fetch_project_log_count
+            if contributor_items is None:
+                fetches['contributors'] = self.fetch_contributors
+            if citations is None:
+                fetches['citation'] = self.fetch_citations
             
-            # Fetch additional data
-            analytics = self.fetch_project_analytics(project_id)
-            logs = self.fetch_project_logs(project_id)
-            file_structure = self.fetch_file_structure(project_id)
-            contributors = self.fetch_contributors(project_id)
-            citations = self.fetch_citations(project_id)
+            # The remaining endpoints are independent, so they run concurrently
+            futures = {name: self._endpoint_pool.submit(fetch, project_id) for name, fetch in fetches.items()}
+            fetched = {name: future.result() for name, future in futures.items()}
+            analytics = fetched['analytics']
+            file_structure, file_downloads, file_kinds = fetched['files']
+            subjects = fetched['subjects'] if subject_items is None else self._parse_subjects(subject_items)
+            if log_count is None:
+                log_count = fetched['log_count']
+            contributors = (fetched['contributors'] if contributor_items is None
+                            else self._parse_contributors(contributor_items))
+            if citations is None:
+                citations = fetched['citation']
             
             # Calculate metrics
-            total_downloads = self.count_total_downloads(file_structure)
-            total_files = self.count_total_files(file_structure)
-            log_count = len(logs.get('data', []))
+            total_downloads = sum(file_downloads)
+            total_files = file_kinds.count('file')
             
             result = {
                 'project_id': project_id,
@@ -303,57 +565,49 @@ class OSFMetadataFetcher:
             return result
             
         except Exception as e:
-            print(f"Error processing {url}: {e}")
+            logger.error("Error processing %s: %s", url, e)
             return {
                 'url': url,
                 'error': str(e)
             }
     
-    def process_urls(self, urls: List[str], delay: float = 2.0) -> List[Dict[str, Any]]:
-        """Process multiple OSF URLs with rate limiting and retry logic"""
+    def dedupe_urls(self, urls: List[str]) -> List[str]:
+        """Keep the first URL seen for each project id, preserving order"""
+        by_project = {}
+        for url in urls:
+            try:
+                key = self.extract_project_id(url)
+            except ValueError:
+                # Unparseable URLs are kept so they still show up as failures
+                key = url
+            by_project.setdefault(key, url)
+        return list(by_project.values())
+    
+    def process_urls(self, urls: List[str], checkpoint_file: str = 'osf_checkpoint.jsonl') -> List[Dict[str, Any]]:
+        """Process multiple OSF URLs concurrently; pacing and 429 retries happen per request in _get"""
         results = []
-        
-        for i, url in enumerate(urls):
-            print(f"Processing {i+1}/{len(urls)}: {url}")
-            
-            # Retry logic for rate limiting
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    result = self.process_project(url)
-                    results.append(result)
-                    break
-                except Exception as e:
-                    if "429" in str(e) and attempt < max_retries - 1:
-                        wait_time = (attempt + 1) * 30  # 30, 60, 90 seconds
-                        print(f"  Rate limited, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"  Failed after {attempt + 1} attempts: {e}")
-                        results.append({
-                            'url': url,
-                            'error': str(e)
-                        })
-                        break
-            
-            # Rate limiting between requests
-            if i < len(urls) - 1:
-                time.sleep(delay)
-            
-            # Save checkpoint every 10 projects
-            if (i + 1) % 10 == 0:
-                checkpoint_file = f'osf_checkpoint_{i+1}.json'
-                with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False, default=str)
-                print(f"  Checkpoint saved: {checkpoint_file}")
+        # Variants of the same project URL would otherwise be fetched once each
+        urls = self.dedupe_urls(urls)
+
+        logger.info("Processing %s URLs with %s workers", len(urls), self.max_workers)
+        # Each finished project is appended to the checkpoint as one JSON line, so a crash loses at most one
+        with open(checkpoint_file, 'ab') as checkpoint, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # map() yields in input order, so results and checkpoint lines keep the order of the URL list
+            for i, (url, result) in enumerate(zip(urls, executor.map(self.process_project, urls))):
+                logger.info("Processed %s/%s: %s", i+1, len(urls), url)
+                results.append(result)
+                checkpoint.write(_dumps(result))
+                checkpoint.flush()
+        logger.info("Checkpoint saved: %s", checkpoint_file)
         
         return results
     
     def save_results(self, results: List[Dict[str, Any]], filename: str = 'osf_metadata.json'):
         """Save results to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
-        print(f"Results saved to {filename}")
+        with open(filename, 'wb') as f:
+            f.write(_dumps(results, pretty=True))
+        logger.info("Results saved to %s", filename)
 
 def main():
     # Read URLs from file
@@ -366,8 +620,24 @@ def main():
         print("Error: osf_ohx_links.txt not found")
         return
     
-    fetcher = OSFMetadataFetcher()
-    results = fetcher.process_urls(urls, delay=2.0)  # Increased delay to handle rate limiting
+    # Worker threads only enqueue log records; a single listener thread writes them out
+    log_queue = queue.Queue(-1)
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, log_handler)
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+    listener.start()
+    
+    fetcher = OSFMetadataFetcher(max_workers=8)
+    unique_urls = fetcher.dedupe_urls(urls)
+    if len(unique_urls) < len(urls):
+        print(f"Skipping {len(urls) - len(unique_urls)} duplicate project URLs")
+    urls = unique_urls
+    try:
+        results = fetcher.process_urls(urls)
+    finally:
+        fetcher.close()
+        listener.stop()
     
     # Print summary
     successful = 0
@@ -1,18 +1,35 @@
 # %%
 import os
-import json
+import shutil
+import tempfile
+import orjson
 import time
+import random
+import logging
 import yaml
+import sqlite3
 import pandas as pd
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs
 from typing import Dict, List, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-import requests
-from datetime import datetime
+from threading import Lock, Condition
+import httpx
+from datetime import date, datetime
 from ghapi.all import GhApi
 from py_ascii_tree import ascii_tree
-from collections import Counter
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader
+
+logger = logging.getLogger(__name__)
+
+# Pretty-printed UTF-8 output, equivalent to json.dump(indent=2, ensure_ascii=False)
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+WRITE_BUFFER_SIZE = 1 << 20
 
 # %%
 #######################
@@ -24,6 +41,9 @@ class GitHubTokenManager:
         self.tokens = []
         self.current_index = 0
         self.lock = Lock()
+        # token index -> (remaining requests, reset timestamp) as last reported by GitHub
+        self.rate_limits = {}
+        self.rate_limit_condition = Condition(self.lock)
 
         if token_file and os.path.exists(token_file):
             self.tokens = self._load_tokens(token_file)
@@ -39,46 +59,50 @@ class GitHubTokenManager:
         print(f"Loaded {len(self.tokens)} GitHub tokens")
 
     def _load_tokens(self, token_file: str) -> List[str]:
+        # Format is decided by extension alone; a broken YAML file is an error, not a text file
+        with open(token_file, 'r') as f:
+            content = f.read()
+        if token_file.endswith(('.yaml', '.yml')):
+            return self._load_yaml_tokens(content)
+        return self._load_text_tokens(content)
+
+    def _load_yaml_tokens(self, content: str) -> List[str]:
+        data = yaml.load(content, Loader=SafeLoader)
+        if not isinstance(data, dict) or 'tokens' not in data:
+            raise ValueError("YAML file must have 'tokens' key")
         tokens = []
-        try:
-            if token_file.endswith('.yaml') or token_file.endswith('.yml'):
-                with open(token_file, 'r') as f:
-                    data = yaml.safe_load(f)
-                    if 'tokens' in data:
-                        for user_data in data['tokens'].values():
-                            token = user_data.get('token')
-                            expiration = user_data.get('expiration_date')
-                            if token and self._is_token_valid(expiration):
-                                tokens.append(token)
-                    else:
-                        raise ValueError("YAML file must have 'tokens' key")
-            else:
-                with open(token_file, 'r') as f:
-                    for line in f:
-                        token = line.strip()
-                        if token and not token.startswith('#'):
-                            tokens.append(token)
-        except yaml.YAMLError as e:
-            print(f"Error parsing YAML file: {e}")
-            print("Trying to load as simple text file...")
-            with open(token_file, 'r') as f:
-                for line in f:
-                    token = line.strip()
-                    if token and not token.startswith('#'):
-                        tokens.append(token)
-        except Exception as e:
-            print(f"Error loading token file: {e}")
+        today = date.today()
+        for user_data in data['tokens'].values():
+            token = user_data.get('token')
+            expiration = user_data.get('expiration_date')
+            if token and self._is_token_valid(expiration, today):
+                tokens.append(token)
+        return tokens
 
+    @staticmethod
+    def _load_text_tokens(content: str) -> List[str]:
+        tokens = []
+        for line in content.splitlines():
+            token = line.strip()
+            if token and not token.startswith('#'):
+                tokens.append(token)
         return tokens
 
-    def _is_token_valid(self, expiration_date: Optional[str]) -> bool:
+    def _is_token_valid(self, expiration_date: Optional[Any], today: Optional[date] = None) -> bool:
         if not expiration_date:
             return True
+        today = today or date.today()
+        # YAML parses unquoted YYYY-MM-DD values into dates (or datetimes, when a time is given)
+        if isinstance(expiration_date, datetime):
+            return expiration_date.date() > today
+        if isinstance(expiration_date, date):
+            return expiration_date > today
         try:
-            exp_date = datetime.strptime(expiration_date, '%Y-%m-%d')
-            return exp_date.date() > datetime.now().date()
-        except:
-            return True
+            exp_date = date.fromisoformat(expiration_date)
+        except (ValueError, TypeError):
+            print(f"Skipping token with malformed expiration_date: {expiration_date!r}")
+            return False
+        return exp_date > today
 
     def get_token(self) -> str:
         with self.lock:
@@ -91,34 +115,195 @@ class GitHubTokenManager:
                 self.current_index = (self.current_index + 1) % len(self.tokens)
                 print(f"Rotated to token {self.current_index + 1}/{len(self.tokens)}")
 
+    def update_rate_limit(self, token_index: int, headers) -> None:
+        # GraphQL and search have their own buckets; only the REST core limit is tracked
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        with self.rate_limit_condition:
+            self.rate_limits[token_index] = (int(remaining), float(reset))
+            self.rate_limit_condition.notify_all()
+
+    def acquire_token(self, threshold: int) -> int:
+        """
+        Return the index of a token with rate limit headroom, rotating away from tokens
+        below the threshold. Blocks until the earliest reset if every token is exhausted.
+        """
+        with self.rate_limit_condition:
+            while True:
+                now = time.time()
+                for offset in range(len(self.tokens)):
+                    index = (self.current_index + offset) % len(self.tokens)
+                    if index not in self.rate_limits:
+                        break
+                    remaining, reset_ts = self.rate_limits[index]
+                    if remaining >= threshold or reset_ts <= now:
+                        # Count this request against the token until fresh headers arrive
+                        self.rate_limits[index] = (remaining - 1, reset_ts)
+                        break
+                else:
+                    wait = min(reset_ts for _, reset_ts in self.rate_limits.values()) - now
+                    print(f"All tokens near rate limit, waiting {wait:.0f}s for reset...")
+                    self.rate_limit_condition.wait(timeout=max(wait, 1))
+                    continue
+
+                if index != self.current_index:
+                    self.current_index = index
+                    print(f"Rotated to token {index + 1}/{len(self.tokens)} (rate limit headroom)")
+                return index
+
+# %%
+#######################
+# Endpoint Cache
+#######################
+
+class EndpointCache:
+    """
+    Persistent cache of endpoint responses keyed by URL. Stores the ETag and
+    Last-Modified headers so unchanged endpoints can be revalidated with a
+    conditional request (GitHub does not count 304s against the rate limit).
+    """
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "endpoints.sqlite"), check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS endpoints ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, status INTEGER, body TEXT)"
+            )
+            self.conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, status, body FROM endpoints WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, status, body = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "status": status,
+            "json": orjson.loads(body)
+        }
+
+    def set(self, url: str, response: httpx.Response, data: Any):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO endpoints (url, etag, last_modified, status, body) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, response.status_code, orjson.dumps(data))
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
 # %%
 ####################
 # GitHub API Client
 ####################
 
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 50
+
+# Everything the metadata record needs that GraphQL can return as fields or counts
+GRAPHQL_REPOSITORY_FRAGMENT = """
+fragment RepoFields on Repository {
+  nameWithOwner description url createdAt updatedAt pushedAt diskUsage
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  licenseInfo { name }
+  isArchived isDisabled isPrivate
+  stargazerCount forkCount
+  issues { totalCount }
+  openIssues: issues(states: OPEN) { totalCount }
+  pullRequests { totalCount }
+  openPullRequests: pullRequests(states: OPEN) { totalCount }
+  closedPullRequests: pullRequests(states: [CLOSED, MERGED]) { totalCount }
+  releases(first: 5, orderBy: {field: CREATED_AT, direction: DESC}) {
+    totalCount
+    nodes { tagName name publishedAt isPrerelease }
+  }
+  branches: refs(refPrefix: "refs/heads/") { totalCount }
+  tags: refs(refPrefix: "refs/tags/") { totalCount }
+  languages(first: 100) { edges { size node { name } } }
+  repositoryTopics(first: 100) { nodes { topic { name } } }
+}
+"""
+
+# Endpoints requested with per_page=1 where only the item count is kept (read from the Link header)
+COUNT_ENDPOINTS = frozenset({"issue_count", "open_pr_count", "closed_pr_count"})
+
+# Endpoints GraphQL does not expose; still fetched over REST for GraphQL batches
+REST_FALLBACK_ENDPOINTS = ("contributors", "community", "tree")
+
 class OptimizedGitHubAPIClient:
-    def __init__(self, token_file: Optional[str] = None, max_workers: int = 10):
+    def __init__(self, token_file: Optional[str] = None, max_workers: int = 10,
+                 cache_dir: Optional[str] = None, rate_limit_threshold: int = 50):
         self.max_workers = max_workers
+        self.rate_limit_threshold = rate_limit_threshold
         self.token_manager = GitHubTokenManager(token_file)
+        self.cache = EndpointCache(cache_dir) if cache_dir else None
         self.session_template = {
             "Accept": "application/vnd.github+json",
             "User-Agent": "GitHub-Repo-Analyzer/2.0",
             "X-GitHub-Api-Version": "2022-11-28"
         }
-
-    def _get_session(self) -> requests.Session:
-        session = requests.Session()
-        session.headers.update(self.session_template)
-        token = self.token_manager.get_token()
-        session.headers.update({"Authorization": f"Bearer {token}"})
-        return session
-
-    def _handle_rate_limit(self, response: requests.Response) -> bool:
-        if response.status_code == 403:
+        # One HTTP/2 client per token: all endpoint requests are multiplexed over a shared connection
+        self._clients = [self._build_client(token) for token in self.token_manager.tokens]
+        # Shared pool for endpoint requests of all repositories (instead of one pool per repository)
+        self._endpoint_pool = ThreadPoolExecutor(max_workers=max_workers * 4, thread_name_prefix="endpoint")
+        # Tree responses are spooled here and moved into the project folder by save_all_repo_data
+        self._tree_dir = tempfile.mkdtemp(prefix="github_trees_")
+
+    def _build_client(self, token: str) -> httpx.Client:
+        headers = dict(self.session_template)
+        headers["Authorization"] = f"Bearer {token}"
+        return httpx.Client(
+            http2=True,
+            headers=headers,
+            timeout=30,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_workers * 4)
+        )
+
+    def close(self):
+        self._endpoint_pool.shutdown(wait=True)
+        for client in self._clients:
+            client.close()
+        if self.cache:
+            self.cache.close()
+        shutil.rmtree(self._tree_dir, ignore_errors=True)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> None:
+        # Full jitter so workers that hit a limit together don't retry in lockstep
+        delay = random.uniform(0, min(2 ** attempt, 30))
+        if retry_after:
+            delay = max(delay, retry_after)
+        time.sleep(delay)
+
+    def _handle_rate_limit(self, response: httpx.Response, attempt: int) -> bool:
+        if response.status_code in (403, 429):
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                print(f"Secondary rate limit hit, waiting at least {retry_after}s...")
+                self._backoff(attempt, float(retry_after))
+                return True
             rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
             if rate_limit_remaining == 0 or 'rate limit exceeded' in response.text.lower():
                 print("Rate limit hit, rotating token...")
                 self.token_manager.rotate_token()
+                self._backoff(attempt)
                 return True
         elif response.status_code == 401:
             print("Authentication failed, rotating token...")
@@ -126,88 +311,272 @@ class OptimizedGitHubAPIClient:
             return True
         return False
 
-    def _fetch_endpoint_with_retry(self, endpoint: str, max_retries: int = 3) -> Optional[Any]:
+    @staticmethod
+    def _count_from_response(response: httpx.Response, data: Any) -> int:
+        # With per_page=1 the rel="last" page number is the item count; no Link header means a single page
+        last_url = response.links.get("last", {}).get("url")
+        if last_url:
+            return int(parse_qs(urlparse(last_url).query)["page"][0])
+        return len(data) if isinstance(data, list) else 0
+
+    def _fetch_endpoint_with_retry(self, endpoint: str, max_retries: int = 3, count_only: bool = False) -> Optional[Any]:
+        # A per_page=1 body's ETag only covers the newest item, so counts are never revalidated or cached
+        use_cache = self.cache is not None and not count_only
+        cached = self.cache.get(endpoint) if use_cache else None
+        conditional_headers = {}
+        if cached:
+            if cached["etag"]:
+                conditional_headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                conditional_headers["If-Modified-Since"] = cached["last_modified"]
+
         for attempt in range(max_retries):
             try:
-                session = self._get_session()
-                response = session.get(endpoint, timeout=30)
-                if response.status_code == 200:
-                    return response.json()
+                token_index = self.token_manager.acquire_token(self.rate_limit_threshold)
+                response = self._clients[token_index].get(endpoint, headers=conditional_headers)
+                self.token_manager.update_rate_limit(token_index, response.headers)
+                if response.status_code == 304 and cached:
+                    return cached["json"]
+                elif response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    if count_only:
+                        data = self._count_from_response(response, data)
+                    elif use_cache:
+                        self.cache.set(endpoint, response, data)
+                    return data
                 elif response.status_code == 404:
                     return None
-                elif self._handle_rate_limit(response):
+                elif self._handle_rate_limit(response, attempt):
                     continue
                 else:
                     print(f"HTTP {response.status_code} for {endpoint}")
                     return None
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 print(f"Request error for {endpoint} (attempt {attempt + 1}): {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    self._backoff(attempt)
         return None
 
-    def get_repository_endpoints(self, owner: str, repo: str, tree_sha: str) -> List[str]:
-        base_url = f"https://api.github.com/repos/{owner}/{repo}"
-        return [
-            base_url,
-            f"{base_url}/contributors",
-            f"{base_url}/issues?state=all&per_page=100",
-            f"{base_url}/pulls?state=all&per_page=100",
-            f"{base_url}/releases",
-            f"{base_url}/branches",
-            f"{base_url}/tags",
-            f"{base_url}/community/profile",
-            f"{base_url}/readme",
-            f"{base_url}/git/trees/{tree_sha}?recursive=1",
-            f"{base_url}/languages",
-            f"{base_url}/topics"
+    def _post_graphql_with_retry(self, query: str, variables: Dict[str, Any], max_retries: int = 3) -> Optional[Dict[str, Any]]:
+        payload = orjson.dumps({"query": query, "variables": variables})
+        for attempt in range(max_retries):
+            try:
+                token_index = self.token_manager.acquire_token(self.rate_limit_threshold)
+                response = self._clients[token_index].post(
+                    GRAPHQL_URL, content=payload, headers={"Content-Type": "application/json"}
+                )
+                if response.status_code == 200:
+                    body = orjson.loads(response.content)
+                    # Missing repositories come back as per-alias errors alongside the other results
+                    if body.get("errors"):
+                        logger.debug("GraphQL errors: %s", body["errors"])
+                    return body.get("data") or {}
+                elif self._handle_rate_limit(response, attempt):
+                    continue
+                else:
+                    print(f"HTTP {response.status_code} for GraphQL batch")
+                    return None
+            except httpx.HTTPError as e:
+                print(f"Request error for GraphQL batch (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:
+                    self._backoff(attempt)
+        return None
+
+    @staticmethod
+    def _total_count(node: Dict[str, Any], field: str) -> int:
+        # Connections come back null when a field is not readable with the current token
+        return (node.get(field) or {}).get("totalCount") or 0
+
+    @staticmethod
+    def _graphql_to_raw(node: Dict[str, Any]) -> Dict[str, Any]:
+        # Reshape a GraphQL repository node into the REST payloads _structure_repository_data reads
+        total_count = OptimizedGitHubAPIClient._total_count
+        stars = node.get("stargazerCount") or 0
+        open_issues = total_count(node, "openIssues")
+        open_prs = total_count(node, "openPullRequests")
+        total_prs = total_count(node, "pullRequests")
+        releases = node.get("releases") or {}
+        return {
+            "repository": {
+                "full_name": node.get("nameWithOwner"),
+                "description": node.get("description"),
+                "html_url": node.get("url"),
+                "clone_url": f"{node.get('url')}.git",
+                "created_at": node.get("createdAt"),
+                "updated_at": node.get("updatedAt"),
+                "pushed_at": node.get("pushedAt"),
+                "size": node.get("diskUsage") or 0,
+                "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+                "language": (node.get("primaryLanguage") or {}).get("name"),
+                "license": node.get("licenseInfo"),
+                "archived": node.get("isArchived", False),
+                "disabled": node.get("isDisabled", False),
+                "private": node.get("isPrivate", False),
+                "stargazers_count": stars,
+                "forks_count": node.get("forkCount") or 0,
+                # REST reports stars as watchers_count and counts open PRs as open issues
+                "watchers_count": stars,
+                "open_issues_count": open_issues + open_prs
+            },
+            "releases": [
+                {
+                    "tag_name": r.get("tagName"),
+                    "name": r.get("name"),
+                    "published_at": r.get("publishedAt"),
+                    "prerelease": r.get("isPrerelease", False)
+                } for r in releases.get("nodes") or [] if r
+            ],
+            "languages": {
+                e["node"]["name"]: e.get("size", 0)
+                for e in (node.get("languages") or {}).get("edges") or [] if e and e.get("node")
+            },
+            "topics": {"names": [
+                t["topic"]["name"]
+                for t in (node.get("repositoryTopics") or {}).get("nodes") or [] if t and t.get("topic")
+            ]},
+            "counts": {
+                "total_issues": total_count(node, "issues"),
+                "open_prs": open_prs,
+                "closed_prs": total_count(node, "closedPullRequests"),
+                "total_prs": total_prs,
+                "releases_count": releases.get("totalCount") or 0,
+                "branches_count": total_count(node, "branches"),
+                "tags_count": total_count(node, "tags")
+            }
+        }
+
+    def fetch_repositories_graphql(self, batch: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Fetch a batch of repositories with one aliased GraphQL query, then fill in the
+        endpoints GraphQL doesn't expose over REST. Returns one result per entry in batch
+        ({} for repositories that could not be fetched).
+        """
+        aliases = []
+        variables = {}
+        for i, repo_info in enumerate(batch):
+            aliases.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+            variables[f"o{i}"] = repo_info["owner"]
+            variables[f"n{i}"] = repo_info["repo"]
+        params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(len(batch)))
+        query = f"query({params}) {{ {' '.join(aliases)} }}\n{GRAPHQL_REPOSITORY_FRAGMENT}"
+
+        data = self._post_graphql_with_retry(query, variables)
+        if data is None:
+            return [{} for _ in batch]
+
+        raw_by_index = {}
+        rest_fallback = []
+        future_to_key = {}
+        for i, repo_info in enumerate(batch):
+            node = data.get(f"r{i}")
+            if not node:
+                continue
+            try:
+                raw_by_index[i] = self._graphql_to_raw(node)
+            except (KeyError, TypeError, AttributeError) as e:
+                # A malformed node only costs this repository a REST fetch, not the whole batch
+                print(f"Unexpected GraphQL node for {repo_info['owner']}/{repo_info['repo']}, using REST: {e}")
+                rest_fallback.append(i)
+                continue
+            default_branch = raw_by_index[i]["repository"]["default_branch"] or "main"
+            for name, endpoint in self.get_repository_endpoints(repo_info["owner"], repo_info["repo"], default_branch):
+                if name in REST_FALLBACK_ENDPOINTS:
+                    future_to_key[self._endpoint_pool.submit(self._fetch_endpoint_with_retry, endpoint)] = (i, name)
+
+        for future in as_completed(future_to_key):
+            i, name = future_to_key[future]
+            try:
+                raw_by_index[i][name] = future.result()
+            except Exception as e:
+                print(f"Error fetching {name} for {batch[i]['owner']}/{batch[i]['repo']}: {e}")
+                raw_by_index[i][name] = None
+
+        results = [
+            self._structure_repository_data(raw_by_index[i], repo_info["owner"], repo_info["repo"])
+            if i in raw_by_index else {}
+            for i, repo_info in enumerate(batch)
         ]
+        # Fetched from this batch thread: fetch_repository_data itself waits on the endpoint pool
+        for i in rest_fallback:
+            try:
+                results[i] = self.fetch_repository_data(batch[i]["owner"], batch[i]["repo"])
+            except Exception as e:
+                print(f"Error fetching {batch[i]['owner']}/{batch[i]['repo']} over REST: {e}")
+        return results
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _base_url(owner: str, repo: str) -> str:
+        return f"https://api.github.com/repos/{owner}/{repo}"
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_repository_endpoints(owner: str, repo: str, tree_sha: str) -> Tuple[Tuple[str, str], ...]:
+        # Tuple so the memoized value can't be mutated by a caller
+        base_url = OptimizedGitHubAPIClient._base_url(owner, repo)
+        return (
+            ("repository", base_url),
+            ("contributors", f"{base_url}/contributors"),
+            # The issues listing includes pull requests; issues alone = issue_count - PR counts
+            ("issue_count", f"{base_url}/issues?state=all&per_page=1"),
+            ("open_pr_count", f"{base_url}/pulls?state=open&per_page=1"),
+            ("closed_pr_count", f"{base_url}/pulls?state=closed&per_page=1"),
+            ("releases", f"{base_url}/releases"),
+            ("branches", f"{base_url}/branches"),
+            ("tags", f"{base_url}/tags"),
+            ("community", f"{base_url}/community/profile"),
+            ("tree", f"{base_url}/git/trees/{tree_sha}?recursive=1"),
+            ("languages", f"{base_url}/languages"),
+            ("topics", f"{base_url}/topics")
+        )
 
     # Setup "parallel processing"
     def fetch_repository_data(self, owner: str, repo: str) -> Dict[str, Any]:
-        base_url = f"https://api.github.com/repos/{owner}/{repo}"
-        repo_data = self._fetch_endpoint_with_retry(base_url)
+        repo_data = self._fetch_endpoint_with_retry(self._base_url(owner, repo))
         if not repo_data:
             return {}
         default_branch = repo_data.get("default_branch", "main")
 
         endpoints = self.get_repository_endpoints(owner, repo, default_branch)
-        results = {base_url: repo_data}
-
-        with ThreadPoolExecutor(max_workers=min(len(endpoints), 5)) as executor:
-            future_to_endpoint = {
-                executor.submit(self._fetch_endpoint_with_retry, endpoint): endpoint
-                for endpoint in endpoints
-            }
-            for future in as_completed(future_to_endpoint):
-                endpoint = future_to_endpoint[future]
-                try:
-                    results[endpoint] = future.result()
-                except Exception as e:
-                    print(f"Error fetching {endpoint}: {e}")
-                    results[endpoint] = None
+        results = {"repository": repo_data}
+
+        future_to_name = {
+            self._endpoint_pool.submit(
+                self._fetch_endpoint_with_retry, endpoint, count_only=name in COUNT_ENDPOINTS
+            ): name
+            for name, endpoint in endpoints
+            if name not in results
+        }
+        for future in as_completed(future_to_name):
+            name = future_to_name[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Error fetching {name} for {owner}/{repo}: {e}")
+                results[name] = None
 
         return self._structure_repository_data(results, owner, repo)
 
+    @staticmethod
+    def _endpoint_data(raw_data: Dict[str, Any], name: str, expected_type: type) -> Any:
+        # Missing, failed (None) or unexpected payloads fall back to an empty list/dict
+        value = raw_data.get(name)
+        return value if isinstance(value, expected_type) else expected_type()
+
     # Define the metadata fields to be returned
     def _structure_repository_data(self, raw_data: Dict[str, Any], owner: str, repo: str) -> Dict[str, Any]:
-        base_url = f"https://api.github.com/repos/{owner}/{repo}"
-    
-        repo_data = raw_data.get(base_url, {}) or {}
-        contributors = raw_data.get(f"{base_url}/contributors", []) or []
-        issues = raw_data.get(f"{base_url}/issues?state=all&per_page=100", []) or []
-        pulls = raw_data.get(f"{base_url}/pulls?state=all&per_page=100", []) or []
-        releases = raw_data.get(f"{base_url}/releases", []) or []
-        branches = raw_data.get(f"{base_url}/branches", []) or []
-        tags = raw_data.get(f"{base_url}/tags", []) or []
-        community = raw_data.get(f"{base_url}/community/profile", {}) or {}
-        readme = raw_data.get(f"{base_url}/readme", {}) or {}
-        languages = raw_data.get(f"{base_url}/languages", {}) or {}
-        topics = raw_data.get(f"{base_url}/topics", {}) or {}
-
-        actual_issues = [item for item in issues if 'pull_request' not in item]
-        open_prs = [item for item in pulls if item.get('state') == 'open']
-        closed_prs = [item for item in pulls if item.get('state') == 'closed']
+        repo_data = self._endpoint_data(raw_data, "repository", dict)
+        contributors = self._endpoint_data(raw_data, "contributors", list)
+        releases = self._endpoint_data(raw_data, "releases", list)
+        branches = self._endpoint_data(raw_data, "branches", list)
+        tags = self._endpoint_data(raw_data, "tags", list)
+        community = self._endpoint_data(raw_data, "community", dict)
+        languages = self._endpoint_data(raw_data, "languages", dict)
+        topics = self._endpoint_data(raw_data, "topics", dict)
+
+        open_prs = self._endpoint_data(raw_data, "open_pr_count", int)
+        closed_prs = self._endpoint_data(raw_data, "closed_pr_count", int)
+        total_issues = max(self._endpoint_data(raw_data, "issue_count", int) - open_prs - closed_prs, 0)
 
         ## PULLING DOWN THE REPO TREE + CREATE REP SUMMARY 
         ## Proposed Logic: get the default branch, and then find the specific SHA for that branch
@@ -215,31 +584,16 @@ class OptimizedGitHubAPIClient:
 
         # Resolve the commit SHA for the default branch
         tree_sha = None
-        if branches and isinstance(branches, list):
+        if branches:
         # Find the branch object matching the default branch
             branch_info = next((b for b in branches if b.get("name") == default_branch), None)
             if branch_info:
                 tree_sha = branch_info.get("commit", {}).get("sha")
 
-        # Fallback if branches endpoint is empty or missing
-        if not tree_sha:
-            branch_info = raw_data.get(f"{base_url}/branches/{default_branch}", {})
-            tree_sha = branch_info.get("commit", {}).get("sha")
-
-        # Fetch the repository tree if we have a SHA
-        repo_tree = {}
-        if default_branch:
-            tree_endpoint = f"{base_url}/git/trees/{default_branch}?recursive=1"
-            repo_tree = raw_data.get(tree_endpoint, {}) or {}
-            print(f"DEBUG - Using endpoint: {tree_endpoint}")
-            print(f"DEBUG - Found in raw_data: {tree_endpoint in raw_data}")
-        
-        if repo_tree:
-            print(f"DEBUG - repo_tree keys: {list(repo_tree.keys())}")
+        # The tree endpoint is requested with the default branch name
+        repo_tree = self._endpoint_data(raw_data, "tree", dict)
+        logger.debug("%s/%s - tree found: %s, keys: %s", owner, repo, bool(repo_tree), list(repo_tree))
     
-        if not isinstance(repo_tree, dict):
-            repo_tree = {}
-
         repo_tree_summary = {
             "exists": bool(repo_tree),
             "file_count": len(repo_tree.get("tree", [])) if repo_tree else 0,
@@ -251,15 +605,22 @@ class OptimizedGitHubAPIClient:
             "url": repo_tree.get("url") if repo_tree else None
         }
 
-        # Create LLM-friendly tree structure
-        llm_tree = []
-        if "tree" in repo_tree:
-            for entry in repo_tree["tree"]:
-                llm_tree.append({
-                    "path": entry["path"],
-                    "type": entry["type"],   # 'blob' (file) or 'tree' (folder)
-                    "size": entry.get("size", 0)
-                })
+        # The /readme endpoint returns the whole file base64-encoded; only its location is needed,
+        # so take it from the root of the tree and let fetch_readme_contents handle a missing file
+        readme_blob = next(
+            (
+                item for item in (repo_tree.get("tree", []) if repo_tree else [])
+                if item.get("type") == "blob" and "/" not in item.get("path", "")
+                and item["path"].lower().startswith("readme")
+            ),
+            None
+        )
+        readme_name = readme_blob["path"] if readme_blob else "README.md"
+        readme = {
+            "exists": bool(readme_blob) if repo_tree else True,
+            "size": readme_blob.get("size", 0) if readme_blob else 0,
+            "download_url": f"https://raw.githubusercontent.com/{owner}/{repo}/{default_branch}/{readme_name}"
+        }
 
         result = {
             "repository": {
@@ -285,14 +646,16 @@ class OptimizedGitHubAPIClient:
                 "forks": repo_data.get("forks_count", 0),
                 "watchers": repo_data.get("watchers_count", 0),
                 "open_issues": repo_data.get("open_issues_count", 0),
-                "total_issues": len(actual_issues),
-                "open_prs": len(open_prs),
-                "closed_prs": len(closed_prs),
-                "total_prs": len(pulls),
+                "total_issues": total_issues,
+                "open_prs": open_prs,
+                "closed_prs": closed_prs,
+                "total_prs": open_prs + closed_prs,
                 "releases_count": len(releases),
                 "branches_count": len(branches),
                 "tags_count": len(tags),
-                "contributors_count": len(contributors)
+                "contributors_count": len(contributors),
+                # Exact totals when the source provides them (GraphQL batches)
+                **self._endpoint_data(raw_data, "counts", dict)
             },
             "activity": {
                 "contributors": [
@@ -319,48 +682,63 @@ class OptimizedGitHubAPIClient:
                 "documentation": community.get("documentation"),
                 "files": community.get("files", {})
             },
-            "readme": {
-                "exists": bool(readme),
-                "size": readme.get("size", 0) if readme else 0,
-                "download_url": readme.get("download_url") if readme else None
-            },
+            "readme": readme,
             "repo_tree": {
                 "summary": repo_tree_summary,
                 "repo_url": repo_tree.get("url") if repo_tree else None
             }
         }
     
-    # Create temporary tree so that we can return the LLM friendly version
+    # Spool the raw tree to disk so it isn't carried in memory until the save step
         if repo_tree and "tree" in repo_tree:
-            result["_temp_tree_data"] = {
-                "raw_tree": repo_tree,
-                "llm_tree": llm_tree
-            }
+            with tempfile.NamedTemporaryFile(dir=self._tree_dir, prefix=f"{owner}_{repo}_",
+                                             suffix=".json", delete=False) as f:
+                # Compact: tree files are machine-read and indenting inflates them 2-3x
+                f.write(orjson.dumps(repo_tree))
+            result["_temp_tree_data"] = {"tree_file": f.name}
 
 
         return result
 
-    def process_repositories(self, repositories: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    def process_repositories(self, repositories: List[Dict[str, str]], use_graphql: bool = False) -> List[Dict[str, Any]]:
         results = []
         failed_repos = []
         print(f"Processing {len(repositories)} repositories with {self.max_workers} workers...")
 
     # Submit tasks to ThreadPoolExecutor with projectID, owner, repo
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_repo = {
-                executor.submit(self.fetch_repository_data, repo_info["owner"], repo_info["repo"]): repo_info
-                for repo_info in repositories
-            }
-
-            for i, future in enumerate(as_completed(future_to_repo), 1):
-                repo_info = future_to_repo[future]
-                owner = repo_info["owner"]
-                repo = repo_info["repo"]
-                project_id = repo_info.get("projectID", "unknown_project")
+            if use_graphql:
+                batches = [
+                    repositories[start:start + GRAPHQL_BATCH_SIZE]
+                    for start in range(0, len(repositories), GRAPHQL_BATCH_SIZE)
+                ]
+                future_to_batch = {executor.submit(self.fetch_repositories_graphql, batch): batch for batch in batches}
+            else:
+                future_to_batch = {
+                    executor.submit(lambda info: [self.fetch_repository_data(info["owner"], info["repo"])], repo_info): [repo_info]
+                    for repo_info in repositories
+                }
 
+            i = 0
+            for future in as_completed(future_to_batch):
+                batch = future_to_batch[future]
                 try:
-                    repo_data = future.result()
-                    if repo_data and repo_data.get("repository", {}).get("name"):
+                    batch_data = future.result()
+                    batch_error = None
+                except Exception as e:
+                    batch_data = [None] * len(batch)
+                    batch_error = e
+
+                for repo_info, repo_data in zip(batch, batch_data):
+                    i += 1
+                    owner = repo_info["owner"]
+                    repo = repo_info["repo"]
+                    project_id = repo_info.get("projectID", "unknown_project")
+
+                    if batch_error:
+                        failed_repos.append(repo_info)
+                        print(f"✗ [{i}/{len(repositories)}] Error {owner}/{repo} (Project: {project_id}): {batch_error}")
+                    elif repo_data and repo_data.get("repository", {}).get("name"):
                         # Attach projectID to the repo data for grouping later
                         repo_data["projectID"] = project_id
                         results.append(repo_data)
@@ -368,9 +746,6 @@ class OptimizedGitHubAPIClient:
                     else:
                         failed_repos.append(repo_info)
                         print(f"✗ [{i}/{len(repositories)}] Failed: {owner}/{repo} (Project: {project_id})")
-                except Exception as e:
-                    failed_repos.append(repo_info)
-                    print(f"✗ [{i}/{len(repositories)}] Error {owner}/{repo} (Project: {project_id}): {e}")
 
     # Log failed repositories
         if failed_repos:
@@ -385,6 +760,9 @@ class OptimizedGitHubAPIClient:
 # Misc. Functions
 ########################################
 
+# Owner and repo segments following github.com (https://github.com/o/r or git@github.com:o/r)
+GITHUB_OWNER_REPO_PATTERN = r'github\.com[:/]([^/]+)/([^/]+)'
+
 # Strip url to extract the Owner and Repo names
 def extract_owner_and_repo(url: str) -> Tuple[Optional[str], Optional[str]]:
     try:
@@ -404,25 +782,28 @@ def extract_owner_and_repo(url: str) -> Tuple[Optional[str], Optional[str]]:
 
 # Read in CSV 
 
-def load_repositories_from_csv(csv_path: str) -> List[Dict[str, Any]]:
+def load_repositories_from_csv(csv_path: str, debug: bool = False) -> List[Dict[str, Any]]:
     """
     Load repositories from a CSV file containing a 'documentationUrl' column.
+    Only the URL, projectId, Source and Title columns are read.
     """
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    df = pd.read_csv(csv_path)
+    wanted_columns = {'documentationUrl', 'url', 'projectId', 'Source', 'Title'}
+    df = pd.read_csv(csv_path, usecols=lambda col: col in wanted_columns, dtype=str)
     
     # DEBUG: Print CSV info
-    print(f"\n=== CSV DEBUG INFO ===")
-    print(f"CSV shape: {df.shape}")
-    print(f"CSV columns: {df.columns.tolist()}")
-    
-    # Show first few rows of each column
-    for col in df.columns:
-        print(f"\nColumn '{col}' - first 3 values:")
-        print(f"  {df[col].head(3).tolist()}")
-        print(f"  Unique values: {df[col].nunique()}")
+    if debug:
+        print(f"\n=== CSV DEBUG INFO ===")
+        print(f"CSV shape: {df.shape}")
+        print(f"CSV columns: {df.columns.tolist()}")
+
+        # Show first few rows of each column
+        for col in df.columns:
+            print(f"\nColumn '{col}' - first 3 values:")
+            print(f"  {df[col].head(3).tolist()}")
+            print(f"  Unique values: {df[col].nunique()}")
 
     # Ensure a URL column exists
     if 'documentationUrl' in df.columns:
@@ -432,40 +813,43 @@ def load_repositories_from_csv(csv_path: str) -> List[Dict[str, Any]]:
     else:
         raise ValueError("CSV must contain a 'documentationUrl' or 'url' column.")
 
-    repositories = []
-    project_ids_assigned = []
-    skipped_urls = []
+    for col in ('projectId', 'Source', 'Title'):
+        if col not in df.columns:
+            df[col] = None
 
-    # Extract owner and repo from each URL
-    for idx, row in df.iterrows():
-        url = str(row[url_col]).strip()
-        if not url or url.lower() == "nan":
-            skipped_urls.append(f"Row {idx}: Empty or nan URL")
-            continue
+    skipped_urls = []
 
-        owner, repo = extract_owner_and_repo(url)
-        if not owner or not repo:
-            skipped_urls.append(f"Row {idx}: Could not extract owner/repo from '{url}'")
-            continue
-            
-        # Debug each projectId assignment
-        raw_project_id = row.get('projectId', None)
-        if pd.notna(raw_project_id) and str(raw_project_id).strip():
-            project_id = str(raw_project_id).strip()
-        else:
-            project_id = f"{owner}_{repo}"
-            
-        print(f"Row {idx}: URL='{url}' -> {owner}/{repo}, ProjectID='{project_id}'")
-        project_ids_assigned.append(project_id)
-        
-        repositories.append({
-            "projectID": project_id,
-            "owner": owner,
-            "repo": repo,
-            "full_name": f"{owner}/{repo}",
-            "source": row.get('Source', None),
-            "title": row.get('Title', None)
-        })
+    # Extract owner and repo from every URL in one vectorized pass
+    urls = df[url_col].fillna('').str.strip().str.rstrip('/')
+    empty = (urls == '') | (urls.str.lower() == 'nan')
+    owner_repo = urls.str.extract(GITHUB_OWNER_REPO_PATTERN)
+    df = df.assign(
+        owner=owner_repo[0],
+        repo=owner_repo[1].str.replace(r'\.git$', '', regex=True)
+    )
+    extracted = df['owner'].notna() & df['repo'].fillna('').ne('')
+
+    for idx in df.index[empty]:
+        skipped_urls.append(f"Row {idx}: Empty or nan URL")
+    for idx in df.index[~empty & ~extracted]:
+        skipped_urls.append(f"Row {idx}: Could not extract owner/repo from '{urls[idx]}'")
+
+    df = df[~empty & extracted]
+
+    # Fall back to owner_repo when projectId is missing
+    project_ids = df['projectId'].str.strip()
+    project_ids = project_ids.where(project_ids.fillna('').ne(''), df['owner'] + '_' + df['repo'])
+    df = df.assign(projectID=project_ids, full_name=df['owner'] + '/' + df['repo'])
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for idx, url, owner, repo, project_id in zip(df.index, urls[df.index], df['owner'], df['repo'], df['projectID']):
+            logger.debug("Row %s: URL='%s' -> %s/%s, ProjectID='%s'", idx, url, owner, repo, project_id)
+
+    repositories = (
+        df.rename(columns={'Source': 'source', 'Title': 'title'})
+        [["projectID", "owner", "repo", "full_name", "source", "title"]]
+        .to_dict('records')
+    )
 
     # Show skipped URLs
     if skipped_urls:
@@ -474,17 +858,99 @@ def load_repositories_from_csv(csv_path: str) -> List[Dict[str, Any]]:
             print(f"  {skip}")
 
     # DEBUG: Show projectID distribution
-    from collections import Counter
-    project_counts = Counter(project_ids_assigned)
+    project_counts = Counter(df['projectID'])
     print(f"\n=== PROJECT DISTRIBUTION ===")
     print(f"Total repositories: {len(repositories)}")
     print(f"Unique projects: {len(project_counts)}")
-    for project_id, count in project_counts.most_common():
-        print(f"  Project '{project_id}': {count} repositories")
+    if logger.isEnabledFor(logging.DEBUG):
+        for project_id, count in project_counts.most_common():
+            logger.debug("  Project '%s': %s repositories", project_id, count)
 
     return repositories
 
-def save_all_repo_data(results, repositories_csv_data, output_dir="data"):
+def fetch_readme_contents(readme_info: Dict[str, Any]) -> str:
+    """Download a README from its raw URL; raises on 404 and other HTTP errors."""
+    response = httpx.get(readme_info["download_url"], timeout=30, follow_redirects=True)
+    response.raise_for_status()
+    return response.text
+
+
+def _save_one(project_dir: str, repo_idx: int, repo_info: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, str]]]:
+    """
+    Write one repository's metadata, README and tree files into its project folder.
+    Returns the master index entry (None on failure) and any errors to log.
+    """
+    repo_data = repo_info["repo_data"]
+    owner = repo_info["owner"]
+    name = repo_info["name"]
+    errors = []
+
+    try:
+        # Save metadata
+        metadata_path = os.path.join(project_dir, f"{repo_idx:02d}_metadata.json")
+        with open(metadata_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(repo_data, option=JSON_DUMP_OPTIONS))
+
+        repo_entry = {
+            "repo_index": f"{repo_idx:02d}",
+            "owner": owner,
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "repo_url": repo_data["repository"].get("html_url", ""),
+            "processed_successfully": True
+        }
+
+        readme_info = repo_data.get("readme", {})
+        if readme_info.get("exists") and readme_info.get("download_url"):
+            try:
+                readme_text = fetch_readme_contents(readme_info)
+                readme_path = os.path.join(project_dir, f"{repo_idx:02d}_readme.md")
+                with open(readme_path, "w", encoding="utf-8") as f:
+                    f.write(readme_text)
+                repo_entry["has_readme"] = True
+                repo_entry["readme_file"] = f"{repo_idx:02d}_readme.md"
+            except Exception as e:
+                repo_entry["has_readme"] = False
+                repo_entry["readme_error"] = str(e)
+                errors.append({"repo": f"{owner}/{name}", "error": f"README error: {e}"})
+                logger.warning("README failed for %s/%s: %s", owner, name, e)
+        else:
+            repo_entry["has_readme"] = False
+
+        temp_tree_data = repo_data.pop("_temp_tree_data", None)
+        if temp_tree_data:
+            tree_json_path = os.path.join(project_dir, f"{repo_idx:02d}_repo_tree.json")
+            shutil.move(temp_tree_data["tree_file"], tree_json_path)
+            repo_entry["tree_json_file"] = f"{repo_idx:02d}_repo_tree.json"
+
+            with open(tree_json_path, "rb") as f:
+                tree_entries = orjson.loads(f.read()).get("tree", [])
+            # Folders are implied by the file paths, so only blobs are needed for the ASCII tree
+            paths = [entry["path"] for entry in tree_entries if entry.get("type") == "blob"]
+            del tree_entries
+            if paths:
+                ascii_tree_str = ascii_tree(paths)
+                tree_txt_path = os.path.join(project_dir, f"{repo_idx:02d}_repo_tree.txt")
+                with open(tree_txt_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+                    f.write(ascii_tree_str)
+                repo_entry["has_tree"] = True
+                repo_entry["tree_file"] = f"{repo_idx:02d}_repo_tree.txt"
+            else:
+                repo_entry["has_tree"] = False
+        else:
+            repo_entry["has_tree"] = False
+
+        logger.debug("  %s/%s - README saved: %s, tree saved: %s",
+                     owner, name, repo_entry["has_readme"], repo_entry["has_tree"])
+        return repo_entry, errors
+
+    except Exception as e:
+        errors.append({"repo": f"{owner}/{name}", "error": str(e)})
+        logger.warning("Processing failed for %s/%s: %s", owner, name, e)
+        return None, errors
+
+
+def save_all_repo_data(results, output_dir="data", max_workers=8):
     """
     Enhanced debug version of save_all_repo_data
     """
@@ -493,21 +959,9 @@ def save_all_repo_data(results, repositories_csv_data, output_dir="data"):
 
     print(f"\n=== SAVE DEBUG INFO ===")
     print(f"Input results: {len(results)} repositories")
-    print(f"Input CSV data: {len(repositories_csv_data)} repositories")
-
-    # Create lookup: owner/repo -> projectID
-    project_lookup = {}
-    for csv_repo in repositories_csv_data:
-        try:
-            repo_full_name = f"{csv_repo['owner']}/{csv_repo['repo']}"
-            project_lookup[repo_full_name] = csv_repo.get('projectID', f"fallback_{repo_full_name}")
-        except Exception as e:
-            print(f"DEBUG: Error processing CSV entry {csv_repo}: {e}")
-
-    print(f"Project lookup created: {len(project_lookup)} entries")
 
     # Group repositories by projectID
-    projects = {}
+    projects = defaultdict(list)
     for i, repo_data in enumerate(results):
         if not isinstance(repo_data, dict) or "repository" not in repo_data:
             failed_repos.append({"index": i, "error": "Invalid repo_data structure"})
@@ -516,12 +970,10 @@ def save_all_repo_data(results, repositories_csv_data, output_dir="data"):
         owner = repo_data["repository"].get("owner", "unknown")
         name = repo_data["repository"].get("name", "unknown")
         repo_full_name = f"{owner}/{name}"
-        project_id = repo_data.get("projectID") or project_lookup.get(repo_full_name, f"fallback_{owner}_{name}")
+        # process_repositories attaches projectID to every successful result
+        project_id = repo_data.get("projectID") or f"fallback_{owner}_{name}"
 
-        print(f"Processing {repo_full_name}: projectID = '{project_id}'")
-
-        if project_id not in projects:
-            projects[project_id] = []
+        logger.debug("Processing %s: projectID = '%s'", repo_full_name, project_id)
 
         projects[project_id].append({
             "repo_data": repo_data,
@@ -532,115 +984,56 @@ def save_all_repo_data(results, repositories_csv_data, output_dir="data"):
         })
 
     print(f"\nGrouped into {len(projects)} projects:")
-    for pid, repos in projects.items():
-        print(f"  Project '{pid}': {len(repos)} repositories")
+    if logger.isEnabledFor(logging.DEBUG):
+        for pid, repos in projects.items():
+            logger.debug("  Project '%s': %s repositories", pid, len(repos))
 
-    # Save data for each project
+    # Save data for each project; README downloads and file writes for all repos overlap in the pool
     master_index = []
-    readme_count = 0
-    tree_count = 0
-    
-    for project_id, repos in projects.items():
-        project_dir = os.path.join(output_dir, str(project_id))
-        os.makedirs(project_dir, exist_ok=True)
-
-        project_info = {
-            "project_id": project_id,
-            "repository_count": len(repos),
-            "repositories": []
-        }
-
-        for repo_idx, repo_info in enumerate(repos, 1):
-            repo_data = repo_info["repo_data"]
-            owner = repo_info["owner"]
-            name = repo_info["name"]
-
-            try:
-                # Save metadata
-                metadata_path = os.path.join(project_dir, f"{repo_idx:02d}_metadata.json")
-                with open(metadata_path, "w", encoding="utf-8") as f:
-                    json.dump(repo_data, f, indent=2, ensure_ascii=False)
-
-                repo_entry = {
-                    "repo_index": f"{repo_idx:02d}",
-                    "owner": owner,
-                    "name": name,
-                    "full_name": f"{owner}/{name}",
-                    "repo_url": repo_data["repository"].get("html_url", ""),
-                    "processed_successfully": True
-                }
-
-                # Debug README processing
-                readme_info = repo_data.get("readme", {})
-                print(f"  {owner}/{name} - README info: {readme_info}")
-                
-                if readme_info.get("download_url"):
-                    try:
-                        readme_text = fetch_readme_contents(readme_info)
-                        readme_path = os.path.join(project_dir, f"{repo_idx:02d}_readme.md")
-                        with open(readme_path, "w", encoding="utf-8") as f:
-                            f.write(readme_text)
-                        repo_entry["has_readme"] = True
-                        repo_entry["readme_file"] = f"{repo_idx:02d}_readme.md"
-                        readme_count += 1
-                        print(f"    ✅ README saved")
-                    except Exception as e:
-                        repo_entry["has_readme"] = False
-                        repo_entry["readme_error"] = str(e)
-                        failed_repos.append({"repo": f"{owner}/{name}", "error": f"README error: {e}"})
-                        print(f"    ❌ README failed: {e}")
-                else:
-                    repo_entry["has_readme"] = False
-                    print(f"    ⚠️  No README download_url")
+    project_infos = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_project = {}
+        for project_id, repos in projects.items():
+            project_dir = os.path.join(output_dir, str(project_id))
+            os.makedirs(project_dir, exist_ok=True)
 
-                # Debug tree processing
-                temp_tree_data = repo_data.pop("_temp_tree_data", None)
-                print(f"  {owner}/{name} - Tree data: {bool(temp_tree_data)}")
-                
-                if temp_tree_data:
-                    raw_tree = temp_tree_data.get("raw_tree")
-                    if raw_tree:
-                        tree_json_path = os.path.join(project_dir, f"{repo_idx:02d}_repo_tree.json")
-                        with open(tree_json_path, "w", encoding="utf-8") as f:
-                            json.dump(raw_tree, f, indent=2, ensure_ascii=False)
-                        repo_entry["tree_json_file"] = f"{repo_idx:02d}_repo_tree.json"
-
-                        if "tree" in raw_tree:
-                            paths = [file["path"] for file in raw_tree["tree"]]
-                            if paths:
-                                ascii_tree_str = ascii_tree(paths)
-                                tree_txt_path = os.path.join(project_dir, f"{repo_idx:02d}_repo_tree.txt")
-                                with open(tree_txt_path, "w", encoding="utf-8") as f:
-                                    f.write(ascii_tree_str)
-                                repo_entry["has_tree"] = True
-                                repo_entry["tree_file"] = f"{repo_idx:02d}_repo_tree.txt"
-                                tree_count += 1
-                                print(f"    ✅ Tree saved ({len(paths)} files)")
-                            else:
-                                repo_entry["has_tree"] = False
-                                print(f"    ⚠️  Tree data empty")
-                else:
-                    repo_entry["has_tree"] = False
-                    print(f"    ⚠️  No tree data")
+            project_info = {
+                "project_id": project_id,
+                "repository_count": len(repos),
+                "repositories": []
+            }
+            project_infos[project_id] = project_info
+            master_index.append(project_info)
 
-                project_info["repositories"].append(repo_entry)
+            for repo_idx, repo_info in enumerate(repos, 1):
+                future = executor.submit(_save_one, project_dir, repo_idx, repo_info)
+                future_to_project[future] = project_id
 
-            except Exception as e:
-                failed_repos.append({"repo": f"{owner}/{name}", "error": str(e)})
-                print(f"    ❌ Processing failed: {e}")
+        for future in as_completed(future_to_project):
+            repo_entry, errors = future.result()
+            failed_repos.extend(errors)
+            if repo_entry:
+                project_infos[future_to_project[future]]["repositories"].append(repo_entry)
 
-        master_index.append(project_info)
+    readme_count = 0
+    tree_count = 0
+    for project_info in master_index:
+        # Completion order is arbitrary; keep entries in repo_index order
+        project_info["repositories"].sort(key=lambda entry: int(entry["repo_index"]))
+        for entry in project_info["repositories"]:
+            readme_count += entry["has_readme"]
+            tree_count += entry["has_tree"]
 
     # Save master index
     master_index_path = os.path.join(output_dir, "master_index.json")
-    with open(master_index_path, "w", encoding="utf-8") as f:
-        json.dump(master_index, f, indent=2, ensure_ascii=False)
+    with open(master_index_path, "wb") as f:
+        f.write(orjson.dumps(master_index, option=JSON_DUMP_OPTIONS))
 
     # Save failed repos log
     if failed_repos:
         failed_path = os.path.join(output_dir, "failed_repos.json")
-        with open(failed_path, "w", encoding="utf-8") as f:
-            json.dump(failed_repos, f, indent=2, ensure_ascii=False)
+        with open(failed_path, "wb") as f:
+            f.write(orjson.dumps(failed_repos, option=JSON_DUMP_OPTIONS))
 
     print(f"\n=== FINAL SUMMARY ===")
     print(f"Projects created: {len(projects)}")
@@ -663,8 +1056,8 @@ def get_project_content_for_llm(output_dir="data", project_id=None):
         print("Master index not found. Run save_all_repo_data first.")
         return None
     
-    with open(master_index_path, "r", encoding="utf-8") as f:
-        master_index = json.load(f)
+    with open(master_index_path, "rb") as f:
+        master_index = orjson.loads(f.read())
     
     if project_id is None:
         # Return list of available projects
@@ -675,15 +1068,19 @@ def get_project_content_for_llm(output_dir="data", project_id=None):
         if project["project_id"] == project_id:
             project_dir = os.path.join(output_dir, str(project_id))
             
-            # Collect all READMEs
-            combined_readme = f"# Combined READMEs for Project: {project_id}\n\n"
-            combined_readme += f"This project contains {project['repository_count']} repositories.\n\n"
-            combined_readme += "=" * 80 + "\n\n"
+            # Collect all READMEs (parts are joined once at the end rather than concatenated repeatedly)
+            readme_parts = [
+                f"# Combined READMEs for Project: {project_id}\n\n",
+                f"This project contains {project['repository_count']} repositories.\n\n",
+                "=" * 80 + "\n\n"
+            ]
             
             # Collect all repo trees  
-            combined_tree = f"Combined Repository Trees for Project: {project_id}\n\n"
-            combined_tree += f"This project contains {project['repository_count']} repositories.\n\n"
-            combined_tree += "=" * 80 + "\n\n"
+            tree_parts = [
+                f"Combined Repository Trees for Project: {project_id}\n\n",
+                f"This project contains {project['repository_count']} repositories.\n\n",
+                "=" * 80 + "\n\n"
+            ]
             
             has_readmes = False
             has_trees = False
@@ -695,10 +1092,10 @@ def get_project_content_for_llm(output_dir="data", project_id=None):
                         with open(readme_path, "r", encoding="utf-8") as f:
                             readme_content = f.read()
                         
-                        combined_readme += f"## Repository {repo['repo_index']}: {repo['full_name']}\n\n"
-                        combined_readme += "-" * 60 + "\n\n"
-                        combined_readme += readme_content
-                        combined_readme += "\n\n" + "=" * 80 + "\n\n"
+                        readme_parts.append(f"## Repository {repo['repo_index']}: {repo['full_name']}\n\n")
+                        readme_parts.append("-" * 60 + "\n\n")
+                        readme_parts.append(readme_content)
+                        readme_parts.append("\n\n" + "=" * 80 + "\n\n")
                         has_readmes = True
                 
                 if repo.get("has_tree", False):
@@ -707,17 +1104,17 @@ def get_project_content_for_llm(output_dir="data", project_id=None):
                         with open(tree_path, "r", encoding="utf-8") as f:
                             tree_content = f.read()
                         
-                        combined_tree += f"Repository {repo['repo_index']}: {repo['full_name']}\n"
-                        combined_tree += "-" * 60 + "\n"
-                        combined_tree += tree_content
-                        combined_tree += "\n" + "=" * 80 + "\n\n"
+                        tree_parts.append(f"Repository {repo['repo_index']}: {repo['full_name']}\n")
+                        tree_parts.append("-" * 60 + "\n")
+                        tree_parts.append(tree_content)
+                        tree_parts.append("\n" + "=" * 80 + "\n\n")
                         has_trees = True
             
             return {
                 "project_id": project_id,
                 "repository_count": project["repository_count"],
-                "combined_readme": combined_readme if has_readmes else None,
-                "combined_tree": combined_tree if has_trees else None,
+                "combined_readme": "".join(readme_parts) if has_readmes else None,
+                "combined_tree": "".join(tree_parts) if has_trees else None,
                 "has_readmes": has_readmes,
                 "has_trees": has_trees
             }
@@ -733,37 +1130,44 @@ def create_llm_input_for_project(output_dir="data", project_id=None, include_tre
     if not content:
         return None
     
-    llm_input = f"PROJECT: {content['project_id']}\n"
-    llm_input += f"Repository Count: {content['repository_count']}\n\n"
+    parts = [
+        f"PROJECT: {content['project_id']}\n",
+        f"Repository Count: {content['repository_count']}\n\n"
+    ]
     
     if content['has_readmes']:
-        llm_input += "READMES:\n"
-        llm_input += content['combined_readme'] + "\n"
+        parts.append("READMES:\n")
+        parts.append(content['combined_readme'] + "\n")
     
     if include_trees and content['has_trees']:
-        llm_input += "REPOSITORY TREES:\n"
-        llm_input += content['combined_tree'] + "\n"
+        parts.append("REPOSITORY TREES:\n")
+        parts.append(content['combined_tree'] + "\n")
     
-    return llm_input
+    return "".join(parts)
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
     CSV_PATH = "YOUR_CSV_HERE"
     TOKEN_FILE = "github_tokens.yaml"
     OUTPUT_DIR = "github_data_3"
+    CACHE_DIR = "github_cache"
     MAX_WORKERS = 8
+    USE_GRAPHQL = True  # Batch repository metadata through GraphQL; REST only for what it doesn't expose
 
+    client = None
     try:
         print("Loading repositories from CSV...")
         # FIXED: load_repositories_from_csv returns dictionaries, not tuples
         repositories = load_repositories_from_csv(CSV_PATH)
         print(f"Found {len(repositories)} repositories to process")
 
-        client = OptimizedGitHubAPIClient(token_file=TOKEN_FILE, max_workers=MAX_WORKERS)
+        client = OptimizedGitHubAPIClient(token_file=TOKEN_FILE, max_workers=MAX_WORKERS, cache_dir=CACHE_DIR)
 
         start_time = time.time()
     
-        results = client.process_repositories(repositories)
+        results = client.process_repositories(repositories, use_graphql=USE_GRAPHQL)
         processing_end_time = time.time()
 
         valid_results = [r for r in results if isinstance(r, dict) and "repository" in r]
@@ -773,14 +1177,21 @@ def main():
         print("\nSaving individual repository data...")
         save_start_time = time.time()
     
-        master_index, failed_repos = save_all_repo_data(valid_results, repositories, OUTPUT_DIR)
+        master_index, failed_repos = save_all_repo_data(valid_results, OUTPUT_DIR, max_workers=MAX_WORKERS)
         save_end_time = time.time()
         print(f"Data saving time: {save_end_time - save_start_time:.2f} seconds")
 
         total_time = save_end_time - start_time
-        successful_projects = len([p for p in master_index if any(r.get('processed_successfully', False) for r in p['repositories'])])
-        repos_with_readme = sum(len([r for r in p['repositories'] if r.get('has_readme', False)]) for p in master_index)
-        repos_with_tree = sum(len([r for r in p['repositories'] if r.get('has_tree', False)]) for p in master_index)
+        # One pass over the index instead of three list-building scans
+        successful_projects = 0
+        repo_flags = Counter()
+        for p in master_index:
+            successful_projects += any(r.get('processed_successfully', False) for r in p['repositories'])
+            for r in p['repositories']:
+                repo_flags['readme'] += r.get('has_readme', False)
+                repo_flags['tree'] += r.get('has_tree', False)
+        repos_with_readme = repo_flags['readme']
+        repos_with_tree = repo_flags['tree']
 
         print("\n" + "="*60)
         print("PROCESSING SUMMARY")
@@ -814,6 +1225,9 @@ def main():
         import traceback
         traceback.print_exc()
         raise
+    finally:
+        if client:
+            client.close()
 
 if __name__ == "__main__":
     main()
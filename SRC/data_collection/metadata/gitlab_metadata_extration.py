@@ -1,17 +1,30 @@
 # %%
 import os
-import json
+import gzip
+import orjson
 import time
+import queue
 import yaml
-import pandas as pd
-from urllib.parse import urlparse
+from pyarrow import csv as pacsv
+from urllib.parse import urlparse, parse_qs, quote
 from typing import Dict, List, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from threading import Lock, Thread, BoundedSemaphore
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from datetime import date, datetime
 import logging
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader
+
+# Pretty-printed UTF-8 output, equivalent to json.dump(indent=2, ensure_ascii=False)
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# Compact output for bulk files nobody reads by hand
+COMPACT_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS
+
 # %%
 class GitHubTokenManager:
     
@@ -37,45 +50,58 @@ class GitHubTokenManager:
         tokens = []
         
         try:
+            # Read once; the text fallback below reuses the same buffer
+            with open(token_file, 'r') as f:
+                content = f.read()
+
             if token_file.endswith('.yaml') or token_file.endswith('.yml'):
-                with open(token_file, 'r') as f:
-                    data = yaml.safe_load(f)
-                    if 'tokens' in data:
-                        for user_data in data['tokens'].values():
-                            token = user_data.get('token')
-                            expiration = user_data.get('expiration_date')
-                            
-                            if token and self._is_token_valid(expiration):
-                                tokens.append(token)
-                    else:
-                        raise ValueError("YAML file must have 'tokens' key")
-            else:
-                with open(token_file, 'r') as f:
-                    for line in f:
-                        token = line.strip()
-                        if token and not token.startswith('#'):
+                data = yaml.load(content, Loader=SafeLoader)
+                if 'tokens' in data:
+                    today = date.today()
+                    for user_data in data['tokens'].values():
+                        token = user_data.get('token')
+                        expiration = user_data.get('expiration_date')
+                        
+                        if token and self._is_token_valid(expiration, today):
                             tokens.append(token)
+                else:
+                    raise ValueError("YAML file must have 'tokens' key")
+            else:
+                tokens = self._parse_text_tokens(content)
         except yaml.YAMLError as e:
             print(f"Error parsing YAML file: {e}")
             print("Trying to load as simple text file...")
-            with open(token_file, 'r') as f:
-                for line in f:
-                    token = line.strip()
-                    if token and not token.startswith('#'):
-                        tokens.append(token)
-        except Exception as e:
+            tokens = self._parse_text_tokens(content)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            # Missing file, wrong top-level shape, or token entries that aren't mappings
             print(f"Error loading token file: {e}")
         
         return tokens
+
+    @staticmethod
+    def _parse_text_tokens(content: str) -> List[str]:
+        tokens = []
+        for line in content.splitlines():
+            token = line.strip()
+            if token and not token.startswith('#'):
+                tokens.append(token)
+        return tokens
     
-    def _is_token_valid(self, expiration_date: Optional[str]) -> bool:
+    def _is_token_valid(self, expiration_date: Optional[Any], today: Optional[date] = None) -> bool:
         if not expiration_date:
             return True
+        today = today or date.today()
+        # YAML parses unquoted YYYY-MM-DD values into dates (or datetimes, when a time is given)
+        if isinstance(expiration_date, datetime):
+            return expiration_date.date() > today
+        if isinstance(expiration_date, date):
+            return expiration_date > today
         try:
-            exp_date = datetime.strptime(expiration_date, '%Y-%m-%d')
-            return exp_date.date() > datetime.now().date()
-        except:
-            return True
+            exp_date = date.fromisoformat(expiration_date)
+        except (ValueError, TypeError):
+            print(f"Skipping token with malformed expiration_date: {expiration_date!r}")
+            return False
+        return exp_date > today
     
     def get_token(self) -> str:
         with self.lock:
@@ -89,47 +115,191 @@ class GitHubTokenManager:
                 print(f"Rotated to token {self.current_index + 1}/{len(self.tokens)}")
 
 # %%
+# Longest we'll sleep on a rate limit before retrying with the next token
+MAX_RATE_LIMIT_WAIT = 60
+# Gateway errors worth retrying; the backoff happens outside the in-flight slot
+TRANSIENT_STATUSES = frozenset({502, 503, 504})
+# One {"id", "file"} JSON line per saved project, appended as projects finish, so reruns can resume
+PROGRESS_FILE = "progress.jsonl"
+
+# Shared endpoint threads per repository worker
+ENDPOINT_FANOUT = 4
+
+GITLAB_GRAPHQL_URL = "https://gitlab.com/api/graphql"
+GRAPHQL_BATCH_SIZE = 50
+
+# Project fields and counts for a whole batch of projects in one request
+GRAPHQL_PROJECTS_QUERY = """
+query($ids: [ID!], $first: Int) {
+  projects(ids: $ids, first: $first) {
+    nodes {
+      id name fullPath description webUrl sshUrlToRepo httpUrlToRepo
+      createdAt lastActivityAt archived visibility
+      starCount forksCount openIssuesCount wikiEnabled
+      statistics { repositorySize }
+      repository { rootRef }
+      releases(first: 5, sort: RELEASED_AT_DESC) {
+        count
+        nodes { tagName name releasedAt description }
+      }
+      issueStatusCounts { all }
+      mergeRequests { count }
+    }
+  }
+}
+"""
+
+GITLAB_PROJECTS_URL = "https://gitlab.com/api/v4/projects/"
+
+# Endpoint suffixes relative to a project's base URL; fetched data is keyed by these
+PROJECT_SUFFIX = ""
+CONTRIBUTORS_SUFFIX = "/repository/contributors"
+ISSUES_COUNT_SUFFIX = "/issues?state=all&per_page=1"
+MERGE_REQUESTS_COUNT_SUFFIX = "/merge_requests?state=all&per_page=1"
+RELEASES_SUFFIX = "/releases"
+BRANCHES_COUNT_SUFFIX = "/repository/branches?per_page=1"
+TAGS_COUNT_SUFFIX = "/repository/tags?per_page=1"
+TREE_SUFFIX = "/repository/tree"
+TREE_PAGE_SIZE = 100
+
+# Endpoints requested with per_page=1 where only the item count is kept (X-Total / Link header)
+COUNT_ENDPOINT_SUFFIXES = frozenset({
+    ISSUES_COUNT_SUFFIX, MERGE_REQUESTS_COUNT_SUFFIX, BRANCHES_COUNT_SUFFIX, TAGS_COUNT_SUFFIX
+})
+
+# REST endpoints with no GraphQL equivalent; still fetched per project for GraphQL batches
+REST_FALLBACK_SUFFIXES = (CONTRIBUTORS_SUFFIX, BRANCHES_COUNT_SUFFIX, TAGS_COUNT_SUFFIX, TREE_SUFFIX)
+
 class OptimizedGitLabAPIClient:
+
+    _ENDPOINT_SUFFIXES = (
+        PROJECT_SUFFIX,
+        CONTRIBUTORS_SUFFIX,
+        ISSUES_COUNT_SUFFIX,
+        MERGE_REQUESTS_COUNT_SUFFIX,
+        RELEASES_SUFFIX,
+        BRANCHES_COUNT_SUFFIX,
+        TAGS_COUNT_SUFFIX,
+        TREE_SUFFIX
+    )
     
-    def __init__(self, token_file: Optional[str] = None, max_workers: int = 10):
+    def __init__(self, token_file: Optional[str] = None, max_workers: int = 10, debug: bool = False):
         self.max_workers = max_workers
+        # Per-repo files are only pretty-printed when debugging
+        self.dump_options = JSON_DUMP_OPTIONS if debug else COMPACT_DUMP_OPTIONS
         self.token_manager = GitHubTokenManager(token_file)
         
         self.session_template = {
             "Accept": "application/json",
             "User-Agent": "GitLab-Repo-Analyzer/2.0"
         }
-    
-    def _get_session(self) -> requests.Session:
+
+        # Every worker shares one Session and therefore one keep-alive connection pool, sized
+        # for all in-flight requests (endpoint threads plus the repo workers' own GraphQL calls)
+        self.session = self._build_session(max_workers * (ENDPOINT_FANOUT + 1))
+
+        # Caps concurrent HTTP requests across all workers so bursts don't trip GitLab's abuse detection
+        self._inflight = BoundedSemaphore(max_workers * 3)
+
+        # Endpoint requests for every project share one pool instead of a new executor per project
+        self._endpoint_pool = ThreadPoolExecutor(max_workers=max_workers * ENDPOINT_FANOUT, thread_name_prefix="ep")
+
+    def _build_session(self, pool_size: int) -> requests.Session:
         session = requests.Session()
         session.headers.update(self.session_template)
-        
-        token = self.token_manager.get_token()
-        session.headers.update({"Authorization": f"Bearer {token}"})
+        # No urllib3 retries: its backoff would sleep inside session.get while holding an in-flight
+        # slot, so 429s and transient 5xx are retried by the callers after the slot is released
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         return session
+
+    def _get_session(self) -> requests.Session:
+        return self.session
+
+    def _auth_headers(self) -> Dict[str, str]:
+        # Sent per request rather than stored on the shared Session, so token rotation is thread-safe
+        return {"Authorization": f"Bearer {self.token_manager.get_token()}"}
+
+    def close(self):
+        self._endpoint_pool.shutdown(wait=True)
+        self.session.close()
     
+    @staticmethod
+    def _rate_limit_wait(response: requests.Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        reset = response.headers.get("RateLimit-Reset")
+        if reset and reset.isdigit():
+            return max(float(reset) - time.time(), 0)
+        return MAX_RATE_LIMIT_WAIT
+
+    @staticmethod
+    def _transient_wait(response: requests.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RATE_LIMIT_WAIT)
+        return float(2 ** attempt)
+
     def _handle_rate_limit(self, response: requests.Response) -> bool:
         if response.status_code == 429:  # GitLab uses 429 for rate limiting
-            print("Rate limit hit, waiting...")
-            time.sleep(60)  # Wait 1 minute
+            # Move to the next token and wait only as long as GitLab asks
+            wait = min(self._rate_limit_wait(response), MAX_RATE_LIMIT_WAIT)
+            print(f"Rate limit hit, rotating token and waiting {wait:.1f}s...")
+            self.token_manager.rotate_token()
+            time.sleep(wait)
             return True
         elif response.status_code == 401:
             print("Authentication failed")
             return False
         return False
     
-    def _fetch_endpoint_with_retry(self, endpoint: str, max_retries: int = 3) -> Optional[Any]:
+    @staticmethod
+    def _parse_json(response: requests.Response) -> Any:
+        # Parse the raw bytes directly (no bytes -> str -> JSON detour); GitLab always sends UTF-8,
+        # but decode first if a response ever declares another charset
+        content_type = response.headers.get("Content-Type", "")
+        if "charset=" in content_type and "utf-8" not in content_type.lower():
+            return orjson.loads(response.text)
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def _count_from_response(response: requests.Response) -> Optional[int]:
+        total = response.headers.get("X-Total")
+        if total and total.isdigit():
+            return int(total)
+        last_url = response.links.get("last", {}).get("url")
+        if last_url:
+            return int(parse_qs(urlparse(last_url).query)["page"][0])
+        # Above 10,000 items GitLab drops X-Total and rel="last" but still links the next page
+        if response.headers.get("X-Next-Page") or "next" in response.links:
+            print(f"Item count not reported for {response.url} (over 10,000 items); recording None")
+            return None
+        return len(OptimizedGitLabAPIClient._parse_json(response))
+
+    def _fetch_endpoint_with_retry(self, endpoint: str, max_retries: int = 3, count_only: bool = False) -> Optional[Any]:
+        session = self._get_session()
         for attempt in range(max_retries):
             try:
-                session = self._get_session()
-                response = session.get(endpoint, timeout=30)
+                with self._inflight:
+                    response = session.get(endpoint, headers=self._auth_headers(), timeout=30)
+                status = response.status_code
                 
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
+                # 200 is by far the most common outcome, so it's checked first
+                if status == 200:
+                    if count_only:
+                        return self._count_from_response(response)
+                    return self._parse_json(response)
+                elif status == 404:
                     return None
                 elif self._handle_rate_limit(response):
                     continue
+                elif status in TRANSIENT_STATUSES and attempt < max_retries - 1:
+                    wait = self._transient_wait(response, attempt)
+                    print(f"HTTP {status} for {endpoint}, retrying in {wait:.0f}s")
+                    time.sleep(wait)
+                    continue
                 else:
                     print(f"HTTP {response.status_code} for {endpoint}")
                     return None
@@ -141,50 +311,203 @@ class OptimizedGitLabAPIClient:
                     
         return None
     
+    def _post_graphql_with_retry(self, variables: Dict[str, Any], max_retries: int = 3) -> Optional[Dict[str, Any]]:
+        payload = orjson.dumps({"query": GRAPHQL_PROJECTS_QUERY, "variables": variables})
+        session = self._get_session()
+        for attempt in range(max_retries):
+            try:
+                headers = {**self._auth_headers(), "Content-Type": "application/json"}
+                with self._inflight:
+                    response = session.post(GITLAB_GRAPHQL_URL, data=payload, headers=headers, timeout=60)
+
+                if response.status_code == 200:
+                    body = self._parse_json(response)
+                    if body.get("errors"):
+                        print(f"GraphQL errors: {body['errors']}")
+                    return body.get("data") or {}
+                elif self._handle_rate_limit(response):
+                    continue
+                elif response.status_code in TRANSIENT_STATUSES and attempt < max_retries - 1:
+                    wait = self._transient_wait(response, attempt)
+                    print(f"HTTP {response.status_code} for GraphQL batch, retrying in {wait:.0f}s")
+                    time.sleep(wait)
+                    continue
+                else:
+                    print(f"HTTP {response.status_code} for GraphQL batch")
+                    return None
+
+            except requests.exceptions.RequestException as e:
+                print(f"Request error for GraphQL batch (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:
+                    time.sleep(2 ** attempt)
+
+        return None
+
+    @staticmethod
+    def _graphql_to_raw(node: Dict[str, Any]) -> Dict[str, Any]:
+        # Reshape a GraphQL project node into the REST payloads _structure_repository_data reads.
+        # Connections come back null when the token can't read them, so every one has a default
+        releases = node.get("releases") or {}
+        return {
+            PROJECT_SUFFIX: {
+                "name": node.get("name"),
+                "id": int(node["id"].rsplit("/", 1)[-1]),
+                "path_with_namespace": node.get("fullPath"),
+                "description": node.get("description"),
+                "web_url": node.get("webUrl"),
+                "ssh_url_to_repo": node.get("sshUrlToRepo"),
+                "http_url_to_repo": node.get("httpUrlToRepo"),
+                "created_at": node.get("createdAt"),
+                "last_activity_at": node.get("lastActivityAt"),
+                # GraphQL reports the size as a Float; REST gives an int
+                "statistics": {"repository_size": int((node.get("statistics") or {}).get("repositorySize") or 0)},
+                "default_branch": (node.get("repository") or {}).get("rootRef"),
+                "archived": node.get("archived", False),
+                "visibility": node.get("visibility"),
+                "star_count": node.get("starCount", 0),
+                "forks_count": node.get("forksCount", 0),
+                "open_issues_count": node.get("openIssuesCount", 0),
+                "wiki_enabled": node.get("wikiEnabled", False)
+            },
+            RELEASES_SUFFIX: [
+                {
+                    "tag_name": r.get("tagName"),
+                    "name": r.get("name"),
+                    "released_at": r.get("releasedAt"),
+                    "description": r.get("description")
+                } for r in releases.get("nodes") or [] if r
+            ],
+            "counts": {
+                "releases_count": releases.get("count"),
+                "issues_count": (node.get("issueStatusCounts") or {}).get("all", 0),
+                "merge_requests_count": (node.get("mergeRequests") or {}).get("count")
+            }
+        }
+
+    def fetch_repositories_graphql(self, batch: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch a batch of projects with one GraphQL query, then fill in the endpoints
+        GraphQL doesn't expose over REST. Returns one result per project id in batch
+        ({} for projects that could not be fetched).
+        """
+        data = self._post_graphql_with_retry({
+            "ids": [f"gid://gitlab/Project/{project_id}" for project_id in batch],
+            "first": len(batch)
+        })
+        if data is None:
+            return [{} for _ in batch]
+
+        nodes = {node["id"].rsplit("/", 1)[-1]: node for node in data.get("projects", {}).get("nodes", [])}
+        raw_by_id = {}
+        rest_fallback = []
+        future_to_key = {}
+        for project_id in batch:
+            node = nodes.get(project_id)
+            if not node:
+                continue
+            base_url = f"{GITLAB_PROJECTS_URL}{project_id}"
+            try:
+                raw_by_id[project_id] = self._graphql_to_raw(node)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                # A malformed node only costs this project a REST fetch, not the whole batch
+                print(f"Unexpected GraphQL node for {project_id}, using REST: {e}")
+                rest_fallback.append(project_id)
+                continue
+            for suffix in REST_FALLBACK_SUFFIXES:
+                future = self._endpoint_pool.submit(self._fetch_suffix, base_url, suffix)
+                future_to_key[future] = (project_id, suffix)
+
+        for future in as_completed(future_to_key):
+            project_id, suffix = future_to_key[future]
+            try:
+                raw_by_id[project_id][suffix] = future.result()
+            except Exception as e:
+                print(f"Error fetching {GITLAB_PROJECTS_URL}{project_id}{suffix}: {e}")
+                raw_by_id[project_id][suffix] = None
+
+        results = []
+        for project_id in batch:
+            if project_id in rest_fallback:
+                # Fetched from this batch thread: fetch_repository_data itself waits on the endpoint pool
+                try:
+                    results.append(self.fetch_repository_data(project_id))
+                except Exception as e:
+                    print(f"Error fetching {project_id} over REST: {e}")
+                    results.append({})
+                continue
+            if project_id not in raw_by_id:
+                results.append({})
+                continue
+            repo_data = self._structure_repository_data(raw_by_id[project_id], project_id)
+            # GraphQL has no readme_url; point at the README in the root of the tree if there is one
+            tree = repo_data["repo_tree"]["repo_tree"]
+            readme = next((e for e in tree if e.get("type") == "blob" and e.get("name", "").lower().startswith("readme")), None)
+            if readme and repo_data["repository"]["url"] and repo_data["repository"]["default_branch"]:
+                repo_data["readme"]["readme_url"] = (
+                    f"{repo_data['repository']['url']}/-/blob/{repo_data['repository']['default_branch']}/{readme['path']}"
+                )
+            results.append(repo_data)
+        return results
+
+    def _fetch_tree(self, base_url: str) -> Optional[List[Dict[str, Any]]]:
+        # The tree endpoint is paginated; collect every root entry so README lookups can't miss
+        entries = []
+        page = 1
+        while True:
+            items = self._fetch_endpoint_with_retry(
+                f"{base_url}{TREE_SUFFIX}?per_page={TREE_PAGE_SIZE}&page={page}"
+            )
+            if items is None:
+                return entries or None
+            entries.extend(items)
+            if len(items) < TREE_PAGE_SIZE:
+                return entries
+            page += 1
+
+    def _fetch_suffix(self, base_url: str, suffix: str) -> Optional[Any]:
+        if suffix == TREE_SUFFIX:
+            return self._fetch_tree(base_url)
+        return self._fetch_endpoint_with_retry(base_url + suffix, count_only=suffix in COUNT_ENDPOINT_SUFFIXES)
+
+    @staticmethod
+    def _project_url(project_id: str) -> str:
+        # Path-style ids ("group/project") must be URL-encoded for the REST API
+        return f"{GITLAB_PROJECTS_URL}{quote(project_id, safe='')}"
+
     def fetch_all_endpoints(self, project_id: str) -> List[str]:
-        base_url = f"https://gitlab.com/api/v4/projects/{project_id}"
-        return [
-            base_url,  # Gets project info
-            f"{base_url}/repository/contributors",
-            f"{base_url}/issues?state=all&per_page=100",
-            f"{base_url}/merge_requests?state=all&per_page=100",  # Fixed missing comma
-            f"{base_url}/releases",
-            f"{base_url}/repository/branches",
-            f"{base_url}/repository/tags",
-            f"{base_url}/repository/tree"
-        ]
+        base_url = self._project_url(project_id)
+        return [base_url + suffix for suffix in self._ENDPOINT_SUFFIXES]
 
     def fetch_repository_data(self, project_id: str) -> Dict[str, Any]:
-        endpoints = self.fetch_all_endpoints(project_id)  # Fixed method name
+        base_url = self._project_url(project_id)
         results = {}
         
-        with ThreadPoolExecutor(max_workers=min(len(endpoints), 5)) as executor:
-            future_to_endpoint = {
-                executor.submit(self._fetch_endpoint_with_retry, endpoint): endpoint
-                for endpoint in endpoints
-            }
-            
-            for future in as_completed(future_to_endpoint):
-                endpoint = future_to_endpoint[future]
-                try:
-                    results[endpoint] = future.result()
-                except Exception as e:
-                    print(f"Error fetching {endpoint}: {e}")
-                    results[endpoint] = None
+        # Results are keyed by suffix so structuring doesn't rebuild every URL
+        future_to_suffix = {
+            self._endpoint_pool.submit(self._fetch_suffix, base_url, suffix): suffix
+            for suffix in self._ENDPOINT_SUFFIXES
+        }
+
+        for future in as_completed(future_to_suffix):
+            suffix = future_to_suffix[future]
+            try:
+                results[suffix] = future.result()
+            except Exception as e:
+                print(f"Error fetching {base_url}{suffix}: {e}")
+                results[suffix] = None
         
         return self._structure_repository_data(results, project_id)
     
     def _structure_repository_data(self, raw_data: Dict[str, Any], project_id: str) -> Dict[str, Any]:
-        base_url = f"https://gitlab.com/api/v4/projects/{project_id}"
-
-        repo_data = raw_data.get(base_url, {}) or {}
-        contributors = raw_data.get(f"{base_url}/repository/contributors", []) or []
-        issues = raw_data.get(f"{base_url}/issues?state=all&per_page=100", []) or []
-        merge_requests = raw_data.get(f"{base_url}/merge_requests?state=all&per_page=100", []) or []
-        releases = raw_data.get(f"{base_url}/releases", []) or []
-        branches = raw_data.get(f"{base_url}/repository/branches", []) or []
-        tags = raw_data.get(f"{base_url}/repository/tags", []) or []
-        tree = raw_data.get(f"{base_url}/repository/tree", []) or []
+        repo_data = raw_data.get(PROJECT_SUFFIX, {}) or {}
+        contributors = raw_data.get(CONTRIBUTORS_SUFFIX, []) or []
+        # Counts stay None when GitLab did not report them, rather than a misleading 0
+        issues_count = raw_data.get(ISSUES_COUNT_SUFFIX)
+        merge_requests_count = raw_data.get(MERGE_REQUESTS_COUNT_SUFFIX)
+        releases = raw_data.get(RELEASES_SUFFIX, []) or []
+        branches_count = raw_data.get(BRANCHES_COUNT_SUFFIX)
+        tags_count = raw_data.get(TAGS_COUNT_SUFFIX)
+        tree = raw_data.get(TREE_SUFFIX, []) or []
 
         return {
             "repository": {
@@ -206,10 +529,14 @@ class OptimizedGitLabAPIClient:
                 "stars": repo_data.get("star_count", 0),  # GitLab field
                 "forks": repo_data.get("forks_count", 0),
                 "open_issues": repo_data.get("open_issues_count", 0),
+                "issues_count": issues_count,
+                "merge_requests_count": merge_requests_count,
                 "releases_count": len(releases),
-                "branches_count": len(branches),
-                "tags_count": len(tags),
-                "contributors_count": len(contributors)
+                "branches_count": branches_count,
+                "tags_count": tags_count,
+                "contributors_count": len(contributors),
+                # Exact totals when the source provides them (GraphQL batches)
+                **(raw_data.get("counts") or {})
             },
             "activity": {
                 "contributors": [
@@ -242,32 +569,135 @@ class OptimizedGitLabAPIClient:
 
         }
     
-    def process_repositories(self, project_ids: List[str]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _writer_loop(write_queue: "queue.Queue[Optional[Tuple[str, bytes, bool]]]"):
+        # Drains (filepath, payload, append) items until the None sentinel arrives
+        while True:
+            item = write_queue.get()
+            try:
+                if item is None:
+                    return
+                filepath, payload, append = item
+                if append:
+                    with open(filepath, 'ab') as f:
+                        f.write(payload)
+                    continue
+                # Write-then-rename so a crash never leaves a truncated file behind
+                tmp_path = f"{filepath}.tmp"
+                # Single-shot bytes write straight to the fd, skipping the io buffering layers
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    view = memoryview(payload)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, filepath)
+            except OSError as e:
+                print(f"Error writing {item[0]}: {e}")
+            finally:
+                write_queue.task_done()
+
+    @staticmethod
+    def _load_progress(output_dir: str) -> Dict[str, str]:
+        progress_path = os.path.join(output_dir, PROGRESS_FILE)
+        if not os.path.exists(progress_path):
+            return {}
+        done = {}
+        with open(progress_path, 'rb+') as f:
+            lines = f.read().splitlines(keepends=True)
+            if lines and not lines[-1].endswith(b"\n"):
+                # A run that died mid-append leaves a partial line; terminate it so new entries start clean
+                f.write(b"\n")
+            for line in lines:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    print("Skipping incomplete progress line")
+                    continue
+                # Only trust entries whose data file actually made it to disk
+                if os.path.exists(os.path.join(output_dir, entry["file"])):
+                    done[entry["id"]] = entry["file"]
+        return done
+
+    def process_repositories(self, project_ids: List[str], output_dir: str = "gitlab_data",
+                             use_graphql: bool = False) -> List[Dict[str, Any]]:
         results = []
         failed_repos = []
+
+        # Resume: projects saved by an earlier run are loaded from disk instead of refetched
+        os.makedirs(output_dir, exist_ok=True)
+        progress_path = os.path.join(output_dir, PROGRESS_FILE)
+        done = self._load_progress(output_dir)
+        requested = set(project_ids)
+        for project_id, filename in done.items():
+            if project_id in requested:
+                with open(os.path.join(output_dir, filename), 'rb') as f:
+                    results.append(orjson.loads(f.read()))
+        if results:
+            print(f"Resuming: {len(results)} repositories already saved in {output_dir}/")
+        project_ids = [project_id for project_id in project_ids if project_id not in done]
         
         print(f"Processing {len(project_ids)} repositories with {self.max_workers} workers...")
-        
+
+        # Per-repo files are written by a background thread while the remaining fetches run
+        write_queue = queue.Queue(maxsize=64)
+        writer = Thread(target=self._writer_loop, args=(write_queue,), name="repo-writer", daemon=True)
+        writer.start()
+
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_repo = {
-                executor.submit(self.fetch_repository_data, project_id): project_id
-                for project_id in project_ids
-            }
-            
-            for i, future in enumerate(as_completed(future_to_repo), 1):
-                project_id = future_to_repo[future]
+            # GraphQL global ids need numeric project ids; path-style ids always go through REST
+            graphql_ids = [project_id for project_id in project_ids if project_id.isdigit()] if use_graphql else []
+            batches = [
+                graphql_ids[start:start + GRAPHQL_BATCH_SIZE]
+                for start in range(0, len(graphql_ids), GRAPHQL_BATCH_SIZE)
+            ]
+            future_to_batch = {executor.submit(self.fetch_repositories_graphql, batch): batch for batch in batches}
+            graphql_set = set(graphql_ids)
+            future_to_batch.update({
+                executor.submit(lambda pid: [self.fetch_repository_data(pid)], project_id): [project_id]
+                for project_id in project_ids if project_id not in graphql_set
+            })
+
+            i = 0
+            for future in as_completed(future_to_batch):
+                batch = future_to_batch[future]
                 try:
-                    repo_data = future.result()
-                    if repo_data and repo_data.get("repository", {}).get("name"):
+                    batch_data = future.result()
+                    batch_error = None
+                except Exception as e:
+                    batch_data = [None] * len(batch)
+                    batch_error = e
+
+                for project_id, repo_data in zip(batch, batch_data):
+                    i += 1
+                    if batch_error:
+                        failed_repos.append(project_id)
+                        print(f"✗ [{i}/{len(project_ids)}] Error {project_id}: {batch_error}")
+                    elif repo_data and repo_data.get("repository", {}).get("name"):
                         results.append(repo_data)
+                        # The project id keeps projects that share a name from overwriting each other
+                        filename = f"{repo_data['repository']['name']}_{project_id.replace('/', '_')}_data.json"
+                        write_queue.put((
+                            os.path.join(output_dir, filename),
+                            orjson.dumps(repo_data, option=self.dump_options),
+                            False
+                        ))
+                        # Queued after the data file, so the single writer never records a project before it's saved
+                        done[project_id] = filename
+                        write_queue.put((
+                            progress_path,
+                            orjson.dumps({"id": project_id, "file": filename}, option=orjson.OPT_APPEND_NEWLINE),
+                            True
+                        ))
                         print(f"✓ [{i}/{len(project_ids)}] Completed: {project_id}")
                     else:
                         failed_repos.append(project_id)
                         print(f"✗ [{i}/{len(project_ids)}] Failed: {project_id}")
-                except Exception as e:
-                    failed_repos.append(project_id)
-                    print(f"✗ [{i}/{len(project_ids)}] Error {project_id}: {e}")
-        
+
+        write_queue.put(None)
+        writer.join()
+
         if failed_repos:
             print(f"\nFailed to process {len(failed_repos)} repositories:")
             for project_id in failed_repos:
@@ -276,25 +706,16 @@ class OptimizedGitLabAPIClient:
         return results
     
     def save_results(self, results: List[Dict[str, Any]], output_dir: str = "gitlab_data"):
+        # Individual repository files are already written by process_repositories
         os.makedirs(output_dir, exist_ok=True)
-        
-        for repo_data in results:
-            repo_info = repo_data.get("repository", {})
-            name = repo_info.get("name", "unknown")
-            
-            filename = f"{name}_data.json"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(repo_data, f, indent=2, ensure_ascii=False)
-        
-        combined_path = os.path.join(output_dir, "all_repositories_data.json")
-        with open(combined_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+
+        combined_path = os.path.join(output_dir, "all_repositories_data.json.gz")
+        with gzip.open(combined_path, 'wb', compresslevel=6) as f:
+            f.write(orjson.dumps(results, option=COMPACT_DUMP_OPTIONS))
         
         print(f"\nResults saved to {output_dir}/:")
         print(f"  - {len(results)} individual repository files")
-        print(f"  - all_repositories_data.json (combined data)")
+        print(f"  - all_repositories_data.json.gz (combined data)")
 
 # %%
 def main():
@@ -302,28 +723,37 @@ def main():
     TOKEN_FILE = "gitlab_tokens.yaml" # Use .yaml for gh-tokens-loader or .txt for simple format
     OUTPUT_DIR = "gitlab_data"
     MAX_WORKERS = 8
+    DEBUG = False  # Pretty-print the per-repository JSON files
+    USE_GRAPHQL = True  # Batch project metadata through GraphQL; REST only for what it doesn't expose
 
     try:
         if not os.path.exists(CSV_PATH):
             print(f"Error: File '{CSV_PATH}' not found.")
             return
-        df = pd.read_csv(CSV_PATH)
+        # Only the id column is needed; pyarrow's multithreaded reader skips the rest
+        table = pacsv.read_csv(
+            CSV_PATH,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(include_columns=["id"])
+        )
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         return
     
+    client = None
     try:
         print("Initializing GitLab API client...")
         client = OptimizedGitLabAPIClient(
             token_file=TOKEN_FILE if os.path.exists(TOKEN_FILE) else None,
-            max_workers=MAX_WORKERS
+            max_workers=MAX_WORKERS,
+            debug=DEBUG
         )
 
-        project_ids = [str(pid) for pid in df["id"].dropna()]
+        project_ids = [str(pid) for pid in table.column("id").drop_null().to_pylist()]
         print(f"Found {len(project_ids)} project IDs to process.")
 
         start_time = time.time()
-        results = client.process_repositories(project_ids)
+        results = client.process_repositories(project_ids, OUTPUT_DIR, use_graphql=USE_GRAPHQL)
         end_time = time.time()
 
         client.save_results(results, OUTPUT_DIR)
@@ -350,6 +780,9 @@ def main():
         print("\n3. Environment variable:")
         print("   export GITHUB_TOKEN=ghp_your_token")
         print("\nNote: Built-in token management - no external dependencies required!")
+    finally:
+        if client:
+            client.close()
 
 
 if __name__ == "__main__":
@@ -1,24 +1,197 @@
 #!/usr/bin/env python3
-import requests
-import json
+import os
+import httpx
+import orjson
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import time
 from urllib.parse import urlparse
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Lock
+
+_PROJECT_ID_RE = re.compile(r'osf\.io/([a-zA-Z0-9]{5,})')
+
+# Per-project endpoints fetched side by side after the metadata itself
+ENDPOINT_FANOUT = 6
+# Contributor name lookups in flight at once across all projects
+USER_LOOKUP_FANOUT = 16
+# Folder listings and extra list pages fetched at once across all projects
+FOLDER_FANOUT = 32
+PAGE_FANOUT = 16
+
+# Largest page OSF serves, so long listings take as few round-trips as possible
+PAGE_SIZE = 100
+
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Average requests per second across all threads; the old serial loop managed about 2 with its fixed sleeps
+REQUESTS_PER_SECOND = 2.0
+# Requests that may go out back to back after an idle spell
+REQUEST_BURST = 5
+
+PROGRESS_FILE = 'osf_metadata_progress.jsonl'
+
+# Pretty-printed UTF-8 output, equivalent to json.dump(indent=2, ensure_ascii=False)
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+class RateLimitExhausted(Exception):
+    """A request was still answered with 429 after every retry."""
+
+
+class TokenBucket:
+    """Paces requests to an average rate up front, whether or not the server sends rate-limit headers."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve a token now (the balance may go negative) and sleep off the debt outside the lock
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Tracks OSF's X-RateLimit headers and only blocks callers once the quota is spent."""
 
-class CleanOSFMetadataFetcher:
     def __init__(self):
+        self.remaining = None
+        self.reset_at = 0.0
+        self.condition = Condition()
+
+    def update(self, headers) -> None:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        reset = float(reset)
+        # Accept both an epoch timestamp and a number of seconds until the window resets
+        if reset < 1e9:
+            reset += time.time()
+        with self.condition:
+            self.remaining = int(remaining)
+            self.reset_at = reset
+            self.condition.notify_all()
+
+    def acquire(self) -> None:
+        with self.condition:
+            while self.remaining is not None and self.remaining <= 0:
+                wait = self.reset_at - time.time()
+                if wait <= 0:
+                    self.remaining = None
+                    break
+                print(f"Rate limit exhausted, waiting {wait:.0f}s for reset...")
+                self.condition.wait(timeout=wait)
+            if self.remaining is not None:
+                # Count this request against the quota until fresh headers arrive
+                self.remaining -= 1
+
+class CleanOSFMetadataFetcher:
+    def __init__(self, max_workers: int = 8, requests_per_second: float = REQUESTS_PER_SECOND):
         self.base_url = "https://api.osf.io/v2"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Accept': 'application/vnd.api+json',
-            'User-Agent': 'OSF-Research-Tool/1.0'
-        })
+        self.max_workers = max_workers
+        # Every request goes to api.osf.io: one HTTP/2 client multiplexes all threads' requests
+        # over a shared connection instead of opening one connection per in-flight request
+        self.client = httpx.Client(
+            http2=True,
+            headers={
+                'Accept': 'application/vnd.api+json',
+                'User-Agent': 'OSF-Research-Tool/1.0'
+            },
+            timeout=30,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_workers * (ENDPOINT_FANOUT + 1) + USER_LOOKUP_FANOUT + FOLDER_FANOUT + PAGE_FANOUT
+            )
+        )
+        # Endpoint requests for every project share one pool instead of running one after another
+        self._endpoint_pool = ThreadPoolExecutor(max_workers=max_workers * ENDPOINT_FANOUT, thread_name_prefix="ep")
+        # Contributors recur across projects, so user names are looked up once per run
+        self._user_cache = {}
+        self._user_pool = ThreadPoolExecutor(max_workers=USER_LOOKUP_FANOUT, thread_name_prefix="user")
+        # Folder and page fetches never wait on other tasks in their own pool, so neither can deadlock
+        self._folder_pool = ThreadPoolExecutor(max_workers=FOLDER_FANOUT, thread_name_prefix="folder")
+        self._page_pool = ThreadPoolExecutor(max_workers=PAGE_FANOUT, thread_name_prefix="page")
+        # The token bucket sets the pace; the header-driven limiter only steps in once OSF reports the quota spent
+        self.pacer = TokenBucket(requests_per_second, REQUEST_BURST)
+        self.rate_limiter = RateLimiter()
+
+    def close(self):
+        self._endpoint_pool.shutdown(wait=True)
+        self._user_pool.shutdown(wait=True)
+        self._folder_pool.shutdown(wait=True)
+        self._page_pool.shutdown(wait=True)
+        self.client.close()
+
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the pacer and rate limiter, retrying 429s after Retry-After or 2/4/8s"""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.pacer.acquire()
+            self.rate_limiter.acquire()
+            response = self.client.get(url, **kwargs)
+            self.rate_limiter.update(response.headers)
+            if response.status_code != 429:
+                return response
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                # Raised rather than returned so the project is recorded as failed, not saved with empty fields
+                raise RateLimitExhausted(f"Still rate limited after {MAX_RATE_LIMIT_RETRIES} retries: {url}")
+            retry_after = response.headers.get('Retry-After')
+            wait_time = int(retry_after) if retry_after and retry_after.isdigit() else 2 ** (attempt + 1)
+            print(f"  Rate limited, waiting {wait_time}s before retry {attempt + 1}/{MAX_RATE_LIMIT_RETRIES}")
+            time.sleep(wait_time)
+        return response
     
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        return orjson.loads(response.content)
+
+    def _fetch_page(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = self._get(url, params=params)
+        if response.status_code != 200:
+            return None
+        return self._json(response)
+
+    def _fetch_all_pages(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch every page of a JSON:API list; returns {'data': [...]} or None if the first page fails"""
+        first = self._fetch_page(url, {'page[size]': PAGE_SIZE})
+        if first is None:
+            return None
+        items = list(first.get('data', []))
+        links = first.get('links') or {}
+        meta = links.get('meta') or first.get('meta') or {}
+        # OSF may serve fewer items per page than asked for; a full first page shows the real size
+        total, per_page = meta.get('total'), meta.get('per_page') or len(items)
+        if total is not None and per_page:
+            # The total is known up front, so pages 2..N are requested all at once
+            page_params = [{'page': n, 'page[size]': per_page} for n in range(2, -(-total // per_page) + 1)]
+            for page in self._page_pool.map(self._fetch_page, repeat(url), page_params):
+                if page is None:
+                    break
+                items.extend(page.get('data', []))
+        else:
+            next_url = links.get('next')
+            while next_url:
+                page = self._fetch_page(next_url, None)
+                if page is None:
+                    break
+                items.extend(page.get('data', []))
+                next_url = (page.get('links') or {}).get('next')
+        return {'data': items}
+
     def extract_project_id(self, url: str) -> str:
         """Extract OSF project ID from URL"""
-        pattern = r'osf\.io/([a-zA-Z0-9]{5,})'
-        match = re.search(pattern, url)
+        match = _PROJECT_ID_RE.search(url)
         if match:
             return match.group(1)
         raise ValueError(f"Could not extract project ID from URL: {url}")
@@ -34,9 +207,9 @@ class CleanOSFMetadataFetcher:
         last_error = None
         for endpoint in endpoints:
             try:
-                response = self.session.get(endpoint)
+                response = self._get(endpoint)
                 if response.status_code == 200:
-                    data = response.json()
+                    data = self._json(response)
                     # Add endpoint type info
                     if '/nodes/' in endpoint:
                         data['endpoint_type'] = 'node'
@@ -47,6 +220,8 @@ class CleanOSFMetadataFetcher:
                     return data
                 else:
                     last_error = f"HTTP {response.status_code}"
+            except RateLimitExhausted:
+                raise
             except Exception as e:
                 last_error = str(e)
         
@@ -62,9 +237,8 @@ class CleanOSFMetadataFetcher:
             url = f"{self.base_url}/nodes/{project_id}/subjects/"
             
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._fetch_all_pages(url)
+            if data is not None:
                 subjects = []
                 for subject in data.get('data', []):
                     subjects.append({
@@ -72,6 +246,8 @@ class CleanOSFMetadataFetcher:
                         'parents': subject['attributes'].get('parents', [])
                     })
                 return subjects
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error fetching subjects for {project_id}: {e}")
         return []
@@ -85,10 +261,10 @@ class CleanOSFMetadataFetcher:
         else:
             url = f"{self.base_url}/nodes/{project_id}/contributors/"
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._fetch_all_pages(url)
+            if data is not None:
                 contributors = []
+                pending = []
                 for contrib in data.get('data', []):
                     # Get user info from relationships
                     user_link = contrib.get('relationships', {}).get('users', {}).get('links', {}).get('related', {})
@@ -103,28 +279,36 @@ class CleanOSFMetadataFetcher:
                         'user_id': contrib.get('id', ''),
                         'user_link': user_href
                     }
-                    
-                    # Try to get user name if available
-                    if user_href:
-                        try:
-                            user_response = self.session.get(user_href)
-                            if user_response.status_code == 200:
-                                user_data = user_response.json()
-                                contributor_info['name'] = user_data.get('data', {}).get('attributes', {}).get('full_name', 'Unknown')
-                            else:
-                                contributor_info['name'] = 'Unknown'
-                        except:
-                            contributor_info['name'] = 'Unknown'
-                    else:
-                        contributor_info['name'] = 'Unknown'
-                    
+                    pending.append((contributor_info, user_href))
+                
+                # Resolve the names of users not seen before in one concurrent wave
+                uncached = list({user_href for _, user_href in pending
+                                 if user_href and user_href not in self._user_cache})
+                names = dict(zip(uncached, self._user_pool.map(self.fetch_user_name, uncached)))
+                for contributor_info, user_href in pending:
+                    contributor_info['name'] = self._user_cache.get(user_href) or names.get(user_href) or 'Unknown'
                     contributors.append(contributor_info)
-                    time.sleep(0.1)  # Small delay between user lookups
                 return contributors
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error fetching contributors for {project_id}: {e}")
         return []
     
+    def fetch_user_name(self, user_href: str) -> Optional[str]:
+        """Look up a user's full name; successful lookups are cached for the rest of the run"""
+        try:
+            user_response = self._get(user_href)
+            if user_response.status_code == 200:
+                user_data = self._json(user_response)
+                name = user_data.get('data', {}).get('attributes', {}).get('full_name', 'Unknown')
+                self._user_cache[user_href] = name
+                return name
+        except (httpx.HTTPError, ValueError, AttributeError, TypeError):
+            # Network errors, non-JSON bodies and null "data" only cost this one user their name
+            pass
+        return None
+
     def fetch_project_analytics(self, project_id: str, endpoint_type: str = 'node') -> Dict[str, Any]:
         """Fetch project analytics and metrics"""
         if endpoint_type == 'registration':
@@ -135,9 +319,11 @@ class CleanOSFMetadataFetcher:
             url = f"{self.base_url}/nodes/{project_id}/analytics/"
         
         try:
-            response = self.session.get(url)
+            response = self._get(url)
             if response.status_code == 200:
-                return response.json()
+                return self._json(response)
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error fetching analytics for {project_id}: {e}")
         return {}
@@ -153,13 +339,44 @@ class CleanOSFMetadataFetcher:
             url = f"{self.base_url}/nodes/{project_id}/logs/"
         
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                return response.json()
+            data = self._fetch_all_pages(url)
+            if data is not None:
+                return data
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error fetching logs for {project_id}: {e}")
         return {}
 
+    @staticmethod
+    def _list_total(body: Dict[str, Any]) -> Optional[int]:
+        """Item count JSON:API reports for a whole list, whichever page of it this is"""
+        meta = (body.get('links') or {}).get('meta') or body.get('meta') or {}
+        return meta.get('total')
+
+    def fetch_project_log_count(self, project_id: str, endpoint_type: str = 'node') -> int:
+        """Count project logs from the list total, without downloading the entries"""
+        if endpoint_type == 'registration':
+            url = f"{self.base_url}/registrations/{project_id}/logs/"
+        elif endpoint_type == 'preprint':
+            # Preprints don't have logs in the same way
+            return 0
+        else:
+            url = f"{self.base_url}/nodes/{project_id}/logs/"
+
+        try:
+            data = self._fetch_page(url, {'page[size]': 1})
+            if data is not None:
+                total = self._list_total(data)
+                if total is not None:
+                    return total
+                return len(self.fetch_project_logs(project_id, endpoint_type).get('data', []))
+        except RateLimitExhausted:
+            raise
+        except Exception as e:
+            print(f"Error counting logs for {project_id}: {e}")
+        return 0
+
     def fetch_citations(self, project_id: str, endpoint_type: str = 'node') -> Dict[str, Any]:
         """Fetch citation information"""
         if endpoint_type == 'registration':
@@ -170,9 +387,11 @@ class CleanOSFMetadataFetcher:
             url = f"{self.base_url}/nodes/{project_id}/citation/"
         
         try:
-            response = self.session.get(url)
+            response = self._get(url)
             if response.status_code == 200:
-                return response.json()
+                return self._json(response)
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error fetching citations for {project_id}: {e}")
         return {}
@@ -188,126 +407,122 @@ class CleanOSFMetadataFetcher:
             url = f"{self.base_url}/nodes/{project_id}/files/"
         
         try:
-            response = self.session.get(url)
-            if response.status_code == 200:
-                data = response.json()
+            data = self._fetch_all_pages(url)
+            if data is not None:
                 providers = []
                 for provider in data.get('data', []):
                     providers.append(provider['attributes']['name'])
                 return providers
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error fetching storage providers for {project_id}: {e}")
         return ['osfstorage']  # Default fallback
 
     def fetch_file_structure(self, project_id: str, endpoint_type: str = 'node') -> Dict[str, Any]:
         """Fetch file structure for all storage providers"""
+        return self.crawl_file_structure(project_id, endpoint_type)[0]
+
+    def crawl_file_structure(self, project_id: str,
+                             endpoint_type: str = 'node') -> Tuple[Dict[str, Any], List[int], List[str]]:
+        """Fetch the file tree plus flat downloads/kinds columns of every entry for counting"""
+        downloads = []
+        kinds = []
         if endpoint_type == 'preprint':
-            return {}  # Preprints don't have file structures in the same way
+            return {}, downloads, kinds  # Preprints don't have file structures in the same way
             
         providers = self.fetch_storage_providers(project_id, endpoint_type)
-        all_files = {}
+        provider_files = {}
         
+        # Breadth-first: every folder found at one depth, across all providers, is fetched
+        # concurrently, so the crawl costs one round-trip per level instead of one per folder
+        frontier = []
         for provider in providers:
             if endpoint_type == 'registration':
                 files_url = f"{self.base_url}/registrations/{project_id}/files/{provider}/"
             else:
                 files_url = f"{self.base_url}/nodes/{project_id}/files/{provider}/"
+            frontier.append((files_url, provider, None))
+        
+        level = 0
+        while frontier:
+            if level > 10:  # Prevent infinite recursion
+                for _, _, parent in frontier:
+                    parent['children'] = []
+                break
+            folder_urls = [folder_url for folder_url, _, _ in frontier]
+            folder_providers = [provider for _, provider, _ in frontier]
+            listings = self._folder_pool.map(self.fetch_folder, folder_urls, folder_providers)
+            next_frontier = []
+            for (_, provider, parent), listing in zip(frontier, listings):
+                files = [file_info for file_info, _ in listing]
+                if parent is None:
+                    provider_files[provider] = files
+                else:
+                    parent['children'] = files
+                for file_info, folder_files_url in listing:
+                    downloads.append(file_info['downloads'])
+                    kinds.append(file_info['kind'])
+                    if folder_files_url:
+                        next_frontier.append((folder_files_url, provider, file_info))
+            frontier = next_frontier
+            level += 1
+        
+        return {provider: files for provider, files in provider_files.items() if files}, downloads, kinds
+
+    def fetch_folder(self, folder_url: str, provider: str) -> List[Tuple[Dict[str, Any], str]]:
+        """Fetch one folder listing as (file_info, children url) pairs; the url is empty for files"""
+        try:
+            data = self._fetch_all_pages(folder_url)
+            if data is None:
+                return []
             
-            def get_files_recursive(folder_url: str, level: int = 0) -> List[Dict]:
-                if level > 10:  # Prevent infinite recursion
-                    return []
-                
-                try:
-                    response = self.session.get(folder_url)
-                    if response.status_code != 200:
-                        return []
-                    
-                    data = response.json()
-                    files = []
-                    for item in data.get('data', []):
-                        if not isinstance(item, dict):
-                            continue
-                        attrs = item.get('attributes', {})
-                        if not isinstance(attrs, dict):
-                            continue
-                            
-                        file_info = {
-                            'name': attrs.get('name', ''),
-                            'kind': attrs.get('kind', ''),
-                            'size': attrs.get('size'),
-                            'modified': attrs.get('date_modified'),
-                            'created': attrs.get('date_created'),
-                            'path': attrs.get('materialized_path', ''),
-                            'provider': provider,
-                            'downloads': 0  # Will be updated if metrics available
-                        }
-                        
-                        # Try to get download metrics
-                        version_info = attrs.get('current_version', {})
-                        if isinstance(version_info, dict):
-                            metrics = version_info.get('metrics', {})
-                            if isinstance(metrics, dict):
-                                file_info['downloads'] = metrics.get('downloads', 0)
-                        
-                        # Handle folders recursively
-                        if attrs.get('kind') == 'folder':
-                            relationships = item.get('relationships', {})
-                            files_rel = relationships.get('files', {})
-                            if files_rel and 'links' in files_rel:
-                                related_link = files_rel['links'].get('related', {})
-                                if isinstance(related_link, dict):
-                                    folder_files_url = related_link.get('href', '')
-                                elif isinstance(related_link, str):
-                                    folder_files_url = related_link
-                                else:
-                                    folder_files_url = ''
-                                
-                                if folder_files_url:
-                                    file_info['children'] = get_files_recursive(folder_files_url, level + 1)
-                        
-                        files.append(file_info)
+            files = []
+            for item in data.get('data', []):
+                if not isinstance(item, dict):
+                    continue
+                attrs = item.get('attributes', {})
+                if not isinstance(attrs, dict):
+                    continue
                     
-                    return files
-                except Exception as e:
-                    print(f"Error fetching files from {folder_url}: {e}")
-                    return []
+                file_info = {
+                    'name': attrs.get('name', ''),
+                    'kind': attrs.get('kind', ''),
+                    'size': attrs.get('size'),
+                    'modified': attrs.get('date_modified'),
+                    'created': attrs.get('date_created'),
+                    'path': attrs.get('materialized_path', ''),
+                    'provider': provider,
+                    'downloads': 0  # Will be updated if metrics available
+                }
+                
+                # Try to get download metrics
+                version_info = attrs.get('current_version', {})
+                if isinstance(version_info, dict):
+                    metrics = version_info.get('metrics', {})
+                    if isinstance(metrics, dict):
+                        file_info['downloads'] = metrics.get('downloads', 0)
+                
+                # Folders are crawled by the caller
+                folder_files_url = ''
+                if attrs.get('kind') == 'folder':
+                    relationships = item.get('relationships', {})
+                    files_rel = relationships.get('files', {})
+                    if files_rel and 'links' in files_rel:
+                        related_link = files_rel['links'].get('related', {})
+                        if isinstance(related_link, dict):
+                            folder_files_url = related_link.get('href', '')
+                        elif isinstance(related_link, str):
+                            folder_files_url = related_link
+                
+                files.append((file_info, folder_files_url))
             
-            provider_files = get_files_recursive(files_url)
-            if provider_files:
-                all_files[provider] = provider_files
-        
-        return all_files
-
-    def count_total_downloads(self, file_structure: Dict[str, List[Dict]]) -> int:
-        """Count total downloads across all files in all providers"""
-        def count_files_recursive(files: List[Dict]) -> int:
-            total = 0
-            for item in files:
-                total += item.get('downloads', 0)
-                if item.get('children'):
-                    total += count_files_recursive(item['children'])
-            return total
-        
-        total_downloads = 0
-        for files in file_structure.values():
-            total_downloads += count_files_recursive(files)
-        return total_downloads
-
-    def count_total_files(self, file_structure: Dict[str, List[Dict]]) -> int:
-        """Count total files across all providers"""
-        def count_files_recursive(files: List[Dict]) -> int:
-            count = 0
-            for item in files:
-                if item.get('kind') == 'file':
-                    count += 1
-                if item.get('children'):
-                    count += count_files_recursive(item['children'])
-            return count
-        
-        total_files = 0
-        for files in file_structure.values():
-            total_files += count_files_recursive(files)
-        return total_files
+            return files
+        except RateLimitExhausted:
+            raise
+        except Exception as e:
+            print(f"Error fetching files from {folder_url}: {e}")
+            return []
 
     def count_files_simple(self, project_id: str, endpoint_type: str = 'node') -> int:
         """Simple file count"""
@@ -319,10 +534,12 @@ class CleanOSFMetadataFetcher:
         else:
             url = f"{self.base_url}/nodes/{project_id}/files/osfstorage/"
         try:
-            response = self.session.get(url)
+            response = self._get(url)
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 return len(data.get('data', []))
+        except RateLimitExhausted:
+            raise
         except Exception as e:
             print(f"Error counting files for {project_id}: {e}")
         return 0
@@ -350,6 +567,11 @@ class CleanOSFMetadataFetcher:
                     'url': license_data.get('url', '')
                 }
             
+            # Fetch comprehensive data; the endpoints are independent, so they run concurrently
+            # and pacing is left to the rate limiter
+            fetches = [self.fetch_contributors, self.fetch_project_analytics, self.fetch_project_log_count,
+                       self.crawl_file_structure, self.fetch_citations]
+            
             # Get subjects (try embedded first, fallback to API)
             subjects = []
             if 'subjects' in embeds and embeds['subjects'].get('data'):
@@ -360,29 +582,16 @@ class CleanOSFMetadataFetcher:
                     })
             else:
                 # Fallback to separate API call
-                subjects = self.fetch_project_subjects(project_id, endpoint_type)
-            time.sleep(0.5)  # Rate limiting
+                fetches.append(self.fetch_project_subjects)
             
-            # Fetch comprehensive data
-            contributors = self.fetch_contributors(project_id, endpoint_type)
-            time.sleep(0.5)  # Rate limiting
-            
-            analytics = self.fetch_project_analytics(project_id, endpoint_type)
-            time.sleep(0.5)  # Rate limiting
-            
-            logs = self.fetch_project_logs(project_id, endpoint_type)
-            time.sleep(0.5)  # Rate limiting
-            
-            file_structure = self.fetch_file_structure(project_id, endpoint_type)
-            time.sleep(0.5)  # Rate limiting
-            
-            citations = self.fetch_citations(project_id, endpoint_type)
-            time.sleep(0.5)  # Rate limiting
+            futures = [self._endpoint_pool.submit(fetch, project_id, endpoint_type) for fetch in fetches]
+            contributors, analytics, log_count, (file_structure, file_downloads, file_kinds), citations, *fallback = [future.result() for future in futures]
+            if fallback:
+                subjects = fallback[0]
             
             # Calculate metrics
-            total_downloads = self.count_total_downloads(file_structure)
-            total_files = self.count_total_files(file_structure)
-            log_count = len(logs.get('data', []))
+            total_downloads = sum(file_downloads)
+            total_files = file_kinds.count('file')
             
             result = {
                 'project_id': project_id,
@@ -426,43 +635,47 @@ class CleanOSFMetadataFetcher:
             }
     
     def process_urls_batch(self, urls: List[str], start_index: int = 0) -> List[Dict[str, Any]]:
-        """Process URLs with proper rate limiting"""
+        """Process URLs concurrently; pacing and 429 retries happen per request in _get"""
         results = []
         
-        # Load existing results if resuming
-        if start_index > 0:
-            try:
-                with open('osf_metadata_progress.json', 'r') as f:
-                    results = json.load(f)
-                print(f"Resuming from project {start_index + 1}, loaded {len(results)} existing results")
-            except:
-                print("Could not load existing results, starting fresh")
-                results = []
+        # Load existing results if resuming; a line cut short by a crash is dropped
+        if start_index > 0 and os.path.exists(PROGRESS_FILE):
+            with open(PROGRESS_FILE, 'rb+') as f:
+                line, partial = b'', False
+                for line in f:
+                    try:
+                        results.append(orjson.loads(line))
+                        partial = False
+                    except orjson.JSONDecodeError:
+                        print("Skipping incomplete progress line")
+                        partial = True
+                # New records are appended, so they must not extend an unterminated last line
+                if partial:
+                    f.seek(-len(line), os.SEEK_END)
+                    f.truncate()
+                elif line and not line.endswith(b'\n'):
+                    f.write(b'\n')
+            print(f"Resuming from project {start_index + 1}, loaded {len(results)} existing results")
         
-        for i in range(start_index, len(urls)):
-            url = urls[i]
-            print(f"Processing {i+1}/{len(urls)}: {url}")
-            
-            result = self.process_project(url)
-            results.append(result)
-            
-            # Save progress every 5 projects
-            if (i + 1) % 5 == 0:
-                with open('osf_metadata_progress.json', 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False, default=str)
-                print(f"  Progress saved: {i+1}/{len(urls)} completed")
-            
-            # Rate limiting between projects
-            if i < len(urls) - 1:
-                time.sleep(2.0)  # 2 second delay between projects
+        remaining = urls[start_index:]
+        print(f"Processing {len(remaining)} URLs with {self.max_workers} workers")
+        # Each finished project is appended as one JSON line, so progress costs one record per project
+        with open(PROGRESS_FILE, 'ab' if start_index > 0 else 'wb') as progress, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # map() yields in input order, so results and progress keep the order of the URL list
+            for i, (url, result) in enumerate(zip(remaining, executor.map(self.process_project, remaining)), start_index):
+                print(f"Processed {i+1}/{len(urls)}: {url}")
+                results.append(result)
+                progress.write(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE, default=str))
+                progress.flush()
         
         return results
     
     def save_final_results(self, results: List[Dict[str, Any]]):
         """Save final results"""
         # Save complete results
-        with open('osf_ohx_metadata_final.json', 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+        with open('osf_ohx_metadata_final.json', 'wb') as f:
+            f.write(orjson.dumps(results, option=JSON_DUMP_OPTIONS, default=str))
         
         # Print summary
         successful = len([r for r in results if 'error' not in r])
@@ -493,16 +706,24 @@ def main():
         with open('/Users/nmweber/Desktop/OSH_Datasets/improved_normalized_osf_links.txt', 'r') as f:
             urls = [f"https://{line.strip()}" for line in f if line.strip()]
         print(f"Loaded {len(urls)} URLs")
+        # Rows without a project id would only fail after a network round-trip
+        valid_urls = [url for url in urls if _PROJECT_ID_RE.search(url)]
+        if len(valid_urls) < len(urls):
+            print(f"Skipping {len(urls) - len(valid_urls)} URLs without an OSF project ID")
+        urls = valid_urls
     except FileNotFoundError:
         print("Error: improved_normalized_osf_links.txt not found")
         return
     
-    fetcher = CleanOSFMetadataFetcher()
+    fetcher = CleanOSFMetadataFetcher(max_workers=8)
     
     # Allow resuming from a specific index if needed
     start_index = 0  # Change this to resume from a specific project
     
-    results = fetcher.process_urls_batch(urls, start_index)
+    try:
+        results = fetcher.process_urls_batch(urls, start_index)
+    finally:
+        fetcher.close()
     fetcher.save_final_results(results)
 
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+"""
+Run the OSF metadata fetcher under PyPy.
+
+The per-project work outside of network waits (JSON unpacking, dict building,
+file tree walks) is plain Python, which PyPy's JIT speeds up without changes.
+orjson has no PyPy build, so there the fetcher falls back to the stdlib json module:
+
+    pypy3 -m pip install requests requests-cache
+    pypy3 pypy_main.py
+"""
+import os
+import runpy
+
+if __name__ == "__main__":
+    # OSF-metadata.py is not an importable module name, so run it by path
+    runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "OSF-metadata.py"), run_name="__main__")
@@ -1,25 +1,51 @@
+import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
 BASE_URL = "https://ohwr.org/api/v4/projects"
-params = {
-    "per_page": 100,
-    "page": 1
-}
-
-all_repos = []
-
-while True:
-    response = requests.get(BASE_URL, params=params)
-    if response.status_code != 200:
-        break
-    
-    data = response.json()
-    if not data:
-        break
-    
-    all_repos.extend(data)
-    params["page"] += 1  # Move to next page
+PER_PAGE = 100
+MAX_WORKERS = 16
+
+session = requests.Session()
+# Pages are fetched 16 at a time, so throttling and transient 5xx are retried rather than dropped
+retries = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True, raise_on_status=False)
+session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS, max_retries=retries))
+
+
+def fetch_page(page):
+    response = session.get(BASE_URL, params={"per_page": PER_PAGE, "page": page})
+    # A page that still fails would leave a silent gap in the saved list, so stop instead
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+response = session.get(BASE_URL, params={"per_page": PER_PAGE, "page": 1})
+response.raise_for_status()
+all_repos = orjson.loads(response.content)
+
+total_pages = response.headers.get("X-Total-Pages")
+if total_pages:
+    # GitLab reports the page count up front, so the rest can be fetched at once
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pages = executor.map(fetch_page, range(2, int(total_pages) + 1))
+        all_repos += list(chain.from_iterable(pages))
+elif all_repos:
+    # No X-Total-Pages header (GitLab omits it for very large result sets)
+    page = 2
+    while True:
+        data = fetch_page(page)
+        if not data:
+            break
+
+        all_repos.extend(data)
+        page += 1  # Move to next page
 
 # Save as JSON
-with open("OHR_repos.json", "w") as f:
-    json.dump(all_repos, f, indent=4)
+with open("OHR_repos.json", "wb") as f:
+    f.write(orjson.dumps(all_repos, option=orjson.OPT_INDENT_2))
 
-print(f"Scraped {len(all_repos)} repositories from Open Hardware Repository.")
\ No newline at end of file
+print(f"Scraped {len(all_repos)} repositories from Open Hardware Repository.")
@@ -1,21 +1,28 @@
 # %%
 import os
 import json
-import time
 import yaml
 import pandas as pd
 from urllib.parse import urlparse
 from typing import Dict, List, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from threading import Lock, Semaphore
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import logging
 
+MAX_WORKERS = 16
+MAX_IN_FLIGHT = 10
+
 # %%
 class GitLabAPIClient:
     def __init__(self, token: str):
         self.session = requests.Session()
+        # One pooled connection per worker so keep-alive survives the fan-out
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+        self.session.mount("https://", adapter)
+        self._in_flight = Semaphore(MAX_IN_FLIGHT)
         self.session.headers.update({
             "Private-Token": token,
             "User-Agent": "GitLab-Repo-Fetcher/1.0"
@@ -25,7 +32,8 @@ class GitLabAPIClient:
         project_identifier = (f"ohwr/project/{name}").replace("/", "%2F")
         
         wiki_url = f"https://gitlab.com/api/v4/projects/{project_identifier}/wikis/{page_slug}"
-        response = self.session.get(wiki_url)
+        with self._in_flight:
+            response = self.session.get(wiki_url)
 
         if response.status_code == 200:
             return response.json()['content']
@@ -33,9 +41,7 @@ class GitLabAPIClient:
             raise Exception(f"{name}: May not not have a wiki page.")
         else:
             raise Exception(f"Failed to fetch file: {response.status_code}")
-        
-    time.sleep(1)  
-    
+
 def main(): 
     csv_path = "./osh_test.csv"
     print("Starting main function...") 
@@ -44,7 +50,8 @@ def main():
         if not os.path.exists(csv_path):
             print(f"Error: File '{csv_path}' not found.")
             return
-        df = pd.read_csv(csv_path)
+        # Only the project paths are used, so the other columns are never parsed
+        df = pd.read_csv(csv_path, usecols=["path"], dtype={"path": "string"})
         print(f"CSV loaded. Number of entries: {len(df)}") 
     except Exception as e:
         print(f"Error reading CSV file: {e}")
@@ -60,22 +67,29 @@ def main():
     output_dir = "ohr_wiki_home_files"
     os.makedirs(output_dir, exist_ok=True)
 
-    paths = df["path"].dropna()
+    paths = df["path"].dropna().to_numpy()
     #print(f"Projects to process: {paths.tolist()}")  
 
-    for name in paths:
-        try:
+    page_slug = "Home"
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {}
+        for name in paths:
             print(f"Fetching wiki home file for project: {name}")
-            page_slug = "Home"  
-            content = client.fetch_wiki_home_file(name, page_slug)
+            futures[pool.submit(client.fetch_wiki_home_file, name, page_slug)] = name
+
+        # Write each page as soon as its request finishes
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                content = future.result()
 
-            output_file = os.path.join(output_dir, f"{name.replace('/', '_')}_wiki_home.md")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+                output_file = os.path.join(output_dir, f"{name.replace('/', '_')}_wiki_home.md")
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(content)
 
-            print(f"✅ Saved wiki home file for {name} to {output_file}")
-        except Exception as e:
-            print(f"❌ Error with project {name}: {e}")
+                print(f"✅ Saved wiki home file for {name} to {output_file}")
+            except Exception as e:
+                print(f"❌ Error with project {name}: {e}")
 
 if __name__ == "__main__":
     print("Running script directly...")  
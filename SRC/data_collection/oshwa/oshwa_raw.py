@@ -1,9 +1,11 @@
 # %%
 import requests
 import json
+import orjson
 import pandas as pd
 from pandas import json_normalize
 import time
+from pathlib import Path
 
 # %%
 def get_all_oshwa_projects(api_key, delay=0.1):
@@ -66,12 +68,12 @@ with open("OSHWA_projects.json", "w") as f:
 # %%
 ## Save to CSV
 def flatten_json(json_data):
-    flattened_data = json_normalize(json_data)
+    # Only expand the top level of nested objects to keep the frame narrow
+    flattened_data = json_normalize(json_data, max_level=1)
     return flattened_data
 
 def json_to_csv(json_file, csv_file):
-    with open(json_file, 'r') as f:
-        json_data = json.load(f)
+    json_data = orjson.loads(Path(json_file).read_bytes())
 
     # Flatten JSON data
     flattened_data = flatten_json(json_data)